@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+MCP Task Manager 부하 테스트
+
+mcp_task_manager.py를 하위 프로세스로 실행하고 실제 MCP stdio 프로토콜로
+도구 호출을 보내 전송·직렬화 비용까지 포함한 처리량과 지연 시간을 측정한다.
+
+사용법:
+    # 기본 혼합 (task-resume 위주) 30초, 초당 200건, 동시 요청 16개
+    python benchmarks/load_test.py --rate 200 --concurrency 16 --duration 30
+
+    # 도구 비율 지정
+    python benchmarks/load_test.py --mix task-resume=8,task-start=1,task-list=1
+
+    # 시나리오 파일 재생 (JSON 배열 또는 JSONL, 각 단계는 {"tool", "args", "delay"})
+    python benchmarks/load_test.py --scenario session.jsonl --repeat 100
+
+작업 공간을 지정하지 않으면 임시 디렉토리에 claude.md를 만들고
+task-new → task-new-answer × 7 → task-plan 으로 준비한 뒤, 측정 중 task-start가
+계획을 다 쓰지 않도록 예상 호출 수보다 큰 계획(--plan-tasks)으로 바꾸어 측정한다.
+task-new-answer는 질문 진행 중에만 정상 응답하므로 기본 혼합에 넣지 않는다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from plan_memory import generate_plan
+
+SERVER_SCRIPT = Path(__file__).resolve().parent.parent / "mcp_task_manager.py"
+DEFAULT_MIX = {"task-resume": 8, "task-start": 1, "task-status": 1}
+# 최대 속도(--rate 0)로 돌릴 때 계획 크기 추정에 쓰는 초당 요청 수 상한
+CLOSED_LOOP_RATE_ESTIMATE = 2000
+SETUP_ANSWERS = ["할일 관리", "로그인, 데이터 저장", "간단한 기본 디자인", "새로 개발 필요",
+                 "소셜 로그인", "iOS, Android", "React Native"]
+
+Step = Dict[str, Any]
+
+class Recorder:
+    """도구별 지연 시간과 오류 집계"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+
+    def record(self, tool: str, latency: float, error: bool, failure: bool) -> None:
+        self.latencies.setdefault(tool, []).append(latency)
+        if error:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+        if failure:
+            self.failures[tool] = self.failures.get(tool, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """전체 및 도구별 처리량, p50/p95/p99 지연 시간(ms), 오류율"""
+        def summarize(values: List[float], errors: int, failures: int) -> Dict[str, Any]:
+            ordered = sorted(values)
+            def percentile(p: float) -> float:
+                if not ordered:
+                    return 0.0
+                return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+            count = len(ordered)
+            return {
+                "requests": count,
+                "throughput_rps": count / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(50),
+                "p95_ms": percentile(95),
+                "p99_ms": percentile(99),
+                "error_rate": errors / count if count else 0.0,
+                "failure_rate": failures / count if count else 0.0,
+            }
+
+        all_values = [value for values in self.latencies.values() for value in values]
+        return {
+            "elapsed_s": elapsed,
+            "total": summarize(all_values, sum(self.errors.values()), sum(self.failures.values())),
+            "tools": {
+                tool: summarize(values, self.errors.get(tool, 0), self.failures.get(tool, 0))
+                for tool, values in sorted(self.latencies.items())
+            },
+        }
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """"task-resume=8,task-start=1" 형식의 호출 비율 파싱"""
+    mix = {}
+    for part in text.split(","):
+        tool, _, weight = part.partition("=")
+        mix[tool.strip()] = int(weight or 1)
+    return mix
+
+def load_scenario(file_path: str) -> List[Step]:
+    """시나리오 파일 로드 (JSON 배열 또는 JSONL)"""
+    text = Path(file_path).read_text(encoding="utf-8").strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def mix_steps(mix: Dict[str, int], seed: int):
+    """호출 비율에 따라 무작위 단계를 끝없이 생성"""
+    rng = random.Random(seed)
+    tools, weights = list(mix), list(mix.values())
+    while True:
+        tool = rng.choices(tools, weights)[0]
+        args = {"answer": f"부하 테스트 답변 {rng.randrange(1000)}"} if tool == "task-new-answer" else {}
+        yield {"tool": tool, "args": args}
+
+async def call(session: ClientSession, recorder: Recorder, step: Step, scheduled: float) -> None:
+    """도구 한 번 호출 - 지연 시간은 예정 시각부터 측정 (대기열 지연 포함)"""
+    error = failure = False
+    try:
+        result = await session.call_tool(step["tool"], step.get("args") or {})
+        error = bool(result.isError)
+        text = result.content[0].text if result.content and hasattr(result.content[0], "text") else ""
+        failure = text.startswith("❌")
+    except Exception:
+        error = True
+    recorder.record(step["tool"], time.perf_counter() - scheduled, error, failure)
+
+def estimate_plan_tasks(args: argparse.Namespace, mix: Dict[str, int], scenario: Optional[List[Step]]) -> int:
+    """측정 동안 task-start가 계획을 다 쓰지 않을 만큼의 작업 수 (예상 호출 수의 2배)"""
+    if scenario is not None:
+        starts = sum(step["tool"] == "task-start" for step in scenario) * args.repeat
+    else:
+        requests = args.rate * args.duration if args.rate > 0 else CLOSED_LOOP_RATE_ESTIMATE * args.duration
+        if args.requests is not None:
+            requests = min(requests, args.requests)
+        starts = requests * mix.get("task-start", 0) / sum(mix.values())
+    return max(1000, int(starts * 2))
+
+async def prepare_workspace(session: ClientSession, workspace: str, plan_tasks: int) -> None:
+    """측정 전 요구사항 문서와 작업 계획 준비 - 계획은 plan_tasks개 작업으로 바꾼다"""
+    await session.call_tool("task-new", {})
+    for answer in SETUP_ANSWERS:
+        await session.call_tool("task-new-answer", {"answer": answer})
+    await session.call_tool("task-plan", {})
+    Path(workspace, "docs", "project_task.md").write_bytes(generate_plan(plan_tasks) + b"\n")
+
+async def server_stats(session: ClientSession) -> List[str]:
+    """측정 후 task-status 응답의 서버 지표 줄 (⚙️) 수집"""
+    result = await session.call_tool("task-status", {})
+    text = result.content[0].text if result.content and hasattr(result.content[0], "text") else ""
+    return [line for line in text.splitlines() if line.startswith("⚙️")]
+
+async def run_open_loop(session: ClientSession, recorder: Recorder, steps, rate: float,
+                        concurrency: int, duration: float, total: Optional[int]) -> float:
+    """목표 속도(rate/s)로 요청을 예정 시각에 보내고, 동시 요청 수는 concurrency로 제한"""
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = []
+    started = time.perf_counter()
+    sent = 0
+
+    async def guarded(step: Step, scheduled: float) -> None:
+        async with semaphore:
+            await call(session, recorder, step, scheduled)
+
+    for step in steps:
+        if total is not None and sent >= total:
+            break
+        scheduled = started + (sent / rate if rate > 0 else 0.0) + step.get("delay", 0.0)
+        if rate > 0 and scheduled - started > duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if rate <= 0:
+            # 닫힌 루프: 빈 슬롯이 생길 때까지 기다렸다가 바로 전송
+            await semaphore.acquire()
+            semaphore.release()
+            if time.perf_counter() - started > duration:
+                break
+            scheduled = time.perf_counter()
+        tasks.append(asyncio.create_task(guarded(step, scheduled)))
+        sent += 1
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - started
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    workspace = args.workspace
+    temp_dir = None
+    if workspace is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="task-mcp-load-")
+        workspace = temp_dir.name
+        Path(workspace, "claude.md").write_text("# 부하 테스트\n", encoding="utf-8")
+
+    params = StdioServerParameters(command=sys.executable, args=[str(SERVER_SCRIPT)], cwd=workspace)
+    errlog = sys.stderr if args.server_log else open(os.devnull, "w")
+    try:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+                scenario = load_scenario(args.scenario) if args.scenario else None
+                if temp_dir is not None or args.prepare:
+                    plan_tasks = args.plan_tasks or estimate_plan_tasks(args, mix, scenario)
+                    await prepare_workspace(session, workspace, plan_tasks)
+                if scenario is None and "task-new-answer" in mix:
+                    print("⚠️ task-new-answer는 질문이 끝난 작업 공간에서 ❌ 응답만 돌려줍니다.", file=sys.stderr)
+
+                recorder = Recorder()
+                if scenario is not None:
+                    steps = (step for _ in range(args.repeat) for step in scenario)
+                else:
+                    steps = mix_steps(mix, args.seed)
+                elapsed = await run_open_loop(session, recorder, steps, args.rate, args.concurrency,
+                                              args.duration, args.requests)
+                report = recorder.report(elapsed)
+                report["server"] = await server_stats(session)
+                return report
+    finally:
+        if errlog is not sys.stderr:
+            errlog.close()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+def print_report(report: Dict[str, Any]) -> None:
+    header = f"{'tool':<18}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}{'❌ resp':>9}"
+    print(header)
+    print("-" * len(header))
+    rows: List[Tuple[str, Dict[str, Any]]] = list(report["tools"].items()) + [("TOTAL", report["total"])]
+    for tool, stats in rows:
+        print(f"{tool:<18}{stats['requests']:>10}{stats['throughput_rps']:>10.1f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+              f"{stats['error_rate']:>9.1%}{stats['failure_rate']:>9.1%}")
+    print(f"\n경과 시간: {report['elapsed_s']:.2f}s")
+    for line in report.get("server", []):
+        print(line)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MCP Task Manager stdio 부하 테스트")
+    parser.add_argument("--workspace", help="서버 작업 디렉토리 (생략 시 임시 작업 공간 생성)")
+    parser.add_argument("--prepare", action="store_true", help="지정한 작업 공간도 요구사항/계획부터 준비")
+    parser.add_argument("--mix", help="도구 호출 비율 (예: task-resume=8,task-start=1,task-status=1)")
+    parser.add_argument("--scenario", help="재생할 시나리오 파일 (JSON 배열 또는 JSONL)")
+    parser.add_argument("--repeat", type=int, default=1, help="시나리오 반복 횟수")
+    parser.add_argument("--rate", type=float, default=100.0, help="목표 요청 속도 (req/s, 0이면 최대 속도)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--requests", type=int, default=None, help="최대 요청 수")
+    parser.add_argument("--seed", type=int, default=0, help="호출 혼합 난수 시드")
+    parser.add_argument("--plan-tasks", type=int, default=None,
+                        help="준비할 계획의 작업 수 (생략 시 예상 task-start 호출 수의 2배, 최소 1000)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--server-log", action="store_true", help="서버 stderr 로그를 그대로 출력")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
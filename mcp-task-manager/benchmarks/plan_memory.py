@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+작업 계획 모델 메모리 벤치마크
+
+대분류/중분류/소분류로 구성된 대용량 project_task.md를 생성하여 PlanModel로
+파싱한 뒤, 모델과 task-find용 제목 역색인(TitleIndex)이 유지하는 메모리를
+작업당 바이트로 보고한다.
+
+사용법:
+    python benchmarks/plan_memory.py [--tasks 1000000] [--baseline] [--no-index]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_task_manager import PlanModel, TitleIndex  # noqa: E402
+
+TITLES = ["개발 환경 설정", "사용자 인증 시스템", "CI/CD 파이프라인 설정", "단위 테스트 작성",
+          "API 통신 레이어", "반응형 레이아웃 구현", "모니터링 시스템 구축", "데이터 관리 기능"]
+
+def generate_plan(task_count: int, fanout: int = 10) -> bytes:
+    """대분류 1개당 중분류 fanout개, 중분류 1개당 소분류 fanout개인 계획 생성"""
+    lines = ["# 프로젝트: 벤치마크", ""]
+    count = 0
+    epic = 0
+    while count < task_count:
+        epic += 1
+        lines.append(f"[ ] {epic}. {TITLES[epic % len(TITLES)]} {epic}")
+        count += 1
+        for task in range(1, fanout + 1):
+            if count >= task_count:
+                break
+            lines.append(f"- [ ] {epic}.{task}. {TITLES[task % len(TITLES)]} {epic}-{task}")
+            count += 1
+            for sub in range(1, fanout + 1):
+                if count >= task_count:
+                    break
+                lines.append(f"  - [ ] {epic}.{task}.{sub}. {TITLES[sub % len(TITLES)]} {epic}-{task}-{sub}")
+                count += 1
+    return "\n".join(lines).encode("utf-8")
+
+def measure(build, content):
+    """build(content)가 유지하는 메모리(바이트)와 소요 시간(초) 측정
+
+    tracemalloc은 할당마다 추적 비용이 들어 시간을 부풀리므로, 시간은 추적 없이 한 번
+    따로 실행해 잰다.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    build(content)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    model = build(content)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return model, retained, elapsed
+
+def title_index(model: PlanModel) -> TitleIndex:
+    """모델 전체 제목으로 역색인 생성"""
+    index = TitleIndex()
+    index.sync(model)
+    return index
+
+def dict_model(content: bytes):
+    """비교용: 작업마다 dict 하나를 만드는 단순한 표현"""
+    tasks = []
+    for line in content.decode("utf-8").split("\n"):
+        stripped = line.strip().lstrip("- ")
+        if stripped.startswith("["):
+            status, rest = stripped[1], stripped[4:]
+            task_id, _, title = rest.partition(" ")
+            tasks.append({"id": task_id.rstrip("."), "status": status, "title": title,
+                          "level": task_id.count("."), "line": len(tasks)})
+    return tasks
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="작업 계획 모델 메모리 벤치마크")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="생성할 작업 수")
+    parser.add_argument("--baseline", action="store_true", help="dict 기반 표현과 비교")
+    parser.add_argument("--no-index", action="store_true", help="제목 역색인 측정 생략")
+    args = parser.parse_args()
+
+    content = generate_plan(args.tasks)
+    print(f"계획 파일 크기: {len(content) / 1024 / 1024:.1f} MiB, 작업 수: {args.tasks:,}")
+
+    model, retained, elapsed = measure(PlanModel, content)
+    print(f"PlanModel: {retained / len(model):.1f} bytes/task "
+          f"(총 {retained / 1024 / 1024:.1f} MiB, 파싱 {elapsed:.2f}s)")
+
+    if not args.no_index:
+        index, retained, elapsed = measure(title_index, model)
+        print(f"TitleIndex: {retained / len(model):.1f} bytes/task "
+              f"(총 {retained / 1024 / 1024:.1f} MiB, 색인 {elapsed:.2f}s)")
+        del index
+    del model
+
+    if args.baseline:
+        tasks, retained, elapsed = measure(dict_model, content)
+        print(f"dict 기반: {retained / len(tasks):.1f} bytes/task "
+              f"(총 {retained / 1024 / 1024:.1f} MiB, 파싱 {elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
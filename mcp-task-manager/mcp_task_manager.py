@@ -6,16 +6,58 @@ MCP Task Manager Server
 Tools:
 - /task-new: 새 프로젝트 요구사항 생성
 - /task-plan: 프로젝트 계획 수립  
+- /task-plan-batch: 여러 작업 공간 계획 일괄 수립
 - /task-start: 작업 시작 및 진행 관리
+- /task-complete: 작업 완료 처리
 - /task-resume: 작업 재개
+- /task-status: 진행 상황 확인
+- /task-velocity: 작업 속도와 예상 완료일 확인
+- /task-find: 작업 검색
+- /task-list: 작업 목록 페이지 조회
+- /task-undo: 마지막 계획 수정 되돌리기
+- /task-history: 계획 수정 이력 조회
+- /task-snapshot: 작업 상태 스냅샷 저장
+- /task-restore: 스냅샷으로 작업 상태 복원
 """
 
+import argparse
 import asyncio
+import atexit
+import base64
+import bisect
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import functools
+import hashlib
 import json
+import mmap
+import multiprocessing
 import os
+import queue
+import random
+import re
+import shutil
+import socket
+import struct
+import sys
+import threading
+import time
+import zipfile
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from mcp.server.fastmcp import FastMCP
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from mcp.server.fastmcp import Context, FastMCP
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 array 모듈과 파이썬 반복문으로 집계
+    np = None
 
 # MCP 서버 초기화
 mcp = FastMCP("task-manager")
@@ -29,32 +71,1889 @@ REQUIRED_FILES = {
     "docs/technical_spec.md": "docs/technical_spec.md 파일이 없습니다. 먼저 /task-new 명령으로 요구사항을 작성해주세요."
 }
 
+PLAN_FILE = "docs/project_task.md"
+# 대분류별 분할 저장 - 계획 파일이 임계값(바이트)을 넘으면 자동 분할 (0이면 자동 분할 안 함)
+PLAN_SHARD_THRESHOLD = int(os.environ.get("TASK_MCP_SHARD_THRESHOLD") or 1024 * 1024)
+PLAN_SHARD_DIR = "docs/project_task"
+PLAN_MANIFEST = "docs/project_task.manifest.json"
+# 작업 상태 전환 기록 (열 단위 저장) 위치와 기록자 이름 (TASK_MCP_WORKER, 기본값: 호스트 이름)
+TIMING_DIR = "docs/.task_timing"
+TIMING_WORKER = os.environ.get("TASK_MCP_WORKER") or socket.gethostname()
+# task-velocity 최근 처리량 계산 구간 (일)
+VELOCITY_WINDOW_DAYS = 7
+# 생성 문서 내용 해시 기록 (내용이 같으면 다시 쓰지 않는다)
+DOC_HASHES_FILE = "docs/.doc_hashes.json"
+# 작업 상태 표시 문자와 이름
+TASK_STATUSES = {" ": "대기중", "-": "진행중", "x": "완료"}
+
+# project_task.md 수정 이력 (최대 보관 개수, 전체 내용 체크포인트 간격)
+PLAN_HISTORY_LIMIT = 200
+PLAN_HISTORY_CHECKPOINT_INTERVAL = 50
+
+# 작업 상태 스냅샷 저장 위치 (task-clean으로 지워지지 않도록 docs/ 밖에 둔다)
+SNAPSHOT_DIR = Path(".task_snapshots")
+SNAPSHOT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+SNAPSHOT_RACY_WINDOW_NS = 2_000_000_000
+# 스냅샷 복원 중 docs/ 교체 기록 (교체 도중 중단되면 다음 요청에서 마무리한다)
+RESTORE_JOURNAL = ".task_restore.json"
+
+# task-list 페이지 크기 (기본/최대)와 진행 알림 간격 (검사한 작업 수)
+LIST_PAGE_SIZE = 50
+LIST_MAX_PAGE_SIZE = 500
+LIST_PROGRESS_INTERVAL = 1000
+
+# 읽기 전용 응답 캐시 최대 항목 수
+RESPONSE_CACHE_SIZE = 256
+# 메모리에 둘 계획 모델 수 (분할 모드의 대분류 파일 포함)와 제목 역색인 수
+PLAN_MODEL_CACHE_SIZE = 16
+TITLE_INDEX_CACHE_SIZE = 4
+# inotify 감시 사용 여부 (TASK_MCP_WATCH=0 이면 stat 방식만 사용)
+WATCH_ENABLED = os.environ.get("TASK_MCP_WATCH", "1") != "0"
+
+# 프로젝트(작업 공간)별 동시 실행 수와 대기열 길이 제한
+ADMISSION_CONCURRENCY = int(os.environ.get("TASK_MCP_CONCURRENCY") or 1)
+ADMISSION_QUEUE_DEPTH = int(os.environ.get("TASK_MCP_QUEUE_DEPTH") or 32)
+
+# 도구 호출 추적 (TASK_MCP_TRACE: 샘플링 비율 0~1, 기본 0 = 끔)
+TRACE_SAMPLE_RATE = float(os.environ.get("TASK_MCP_TRACE") or 0)
+TRACE_FILE = os.path.abspath(os.environ.get("TASK_MCP_TRACE_FILE") or ".task_traces/spans.jsonl")
+TRACE_MAX_BYTES = int(os.environ.get("TASK_MCP_TRACE_MAX_BYTES") or 10 * 1024 * 1024)
+TRACE_BACKUPS = 3
+
+class SpanWriter:
+    """추적 구간 기록기 - 백그라운드 스레드가 JSONL 파일에 모아 쓰고, 크기 제한을 넘으면 회전
+
+    도구 실행 경로에서는 큐에 넣기만 하므로 파일 쓰기 대기가 응답 지연에 포함되지 않는다.
+    """
+
+    def __init__(self, file_path: str, max_bytes: int, backups: int):
+        self.file_path = file_path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-writer", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """큐에 남은 구간을 모두 기록할 때까지 대기"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._append(batch)
+            except OSError:
+                # 추적 기록 실패가 도구 실행에 영향을 주지 않도록 버린다
+                pass
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _append(self, batch: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch).encode("utf-8")
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.file_path, 'ab') as f:
+            f.write(data)
+
+    def _rotate(self) -> None:
+        """spans.jsonl → spans.jsonl.1 → ... → spans.jsonl.N (가장 오래된 파일은 삭제)"""
+        if self.backups <= 0:
+            os.remove(self.file_path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.file_path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.file_path}.{index + 1}")
+        os.replace(self.file_path, f"{self.file_path}.1")
+
+_span_writer = SpanWriter(TRACE_FILE, TRACE_MAX_BYTES, TRACE_BACKUPS)
+
+# 현재 추적 구간 (trace_id, span_id) - 샘플링되지 않은 요청은 None
+_active_span: ContextVar[Optional[Tuple[str, str]]] = ContextVar("active_span", default=None)
+_NO_SPAN = contextlib.nullcontext()
+
+class Span:
+    """추적 구간 하나 - 종료 시 소요 시간과 부모 구간을 기록기에 넘긴다"""
+
+    __slots__ = ("name", "trace_id", "parent_id", "span_id", "attrs", "_token", "_wall", "_start")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.attrs = attrs
+
+    def __enter__(self) -> "Span":
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self._token = _active_span.set((self.trace_id, self.span_id))
+        self._wall = time.time()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration_ns = time.perf_counter_ns() - self._start
+        _active_span.reset(self._token)
+        record = {
+            "trace": self.trace_id,
+            "span": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "ts": round(self._wall, 6),
+            "duration_ms": duration_ns / 1e6,
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        _span_writer.write(record)
+        return False
+
+def trace_span(name: str, **attrs: Any):
+    """현재 요청이 샘플링되었으면 하위 구간을 연다 (아니면 아무 일도 하지 않는 컨텍스트)"""
+    active = _active_span.get()
+    if active is None:
+        return _NO_SPAN
+    return Span(name, active[0], active[1], attrs)
+
+def trace_request(name: str):
+    """도구 호출 최상위 구간 - 샘플링 비율에 따라 새 추적 시작"""
+    if _active_span.get() is not None:
+        return trace_span(name)
+    if TRACE_SAMPLE_RATE <= 0 or random.random() >= TRACE_SAMPLE_RATE:
+        return _NO_SPAN
+    return Span(name, f"{random.getrandbits(64):016x}", None, {})
+
+def traced(fn):
+    """비동기 함수 전체를 함수 이름의 추적 구간으로 감싸는 데코레이터"""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        with trace_span(fn.__name__):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+Fingerprints = Tuple[Tuple[str, Optional[Tuple[int, int, int]]], ...]
+
+class WorkspaceSnapshot:
+    """요청 단위 작업 공간 스냅샷
+
+    작업 공간 루트와 docs/ 디렉토리를 각각 os.scandir 한 번으로 읽어 두고, 요청이
+    끝날 때까지 필수 파일 확인·캐시 검증·파일 로드가 같은 결과를 공유한다.
+    목록에 없는 파일은 추가 시스템 호출 없이 없는 것으로 판단하고, 있는 파일의
+    크기·수정 시각은 처음 필요할 때 한 번만 읽는다 (DirEntry가 stat 결과를 보관).
+    요청 중 직접 쓴 파일은 invalidate로 표시하여 이후에는 실제 stat을 사용한다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.docs = os.path.join(root, str(DOCS_DIR))
+        self._scanned: Dict[str, Dict[str, os.DirEntry]] = {}
+        self._stale: set = set()
+
+    def _scan(self, directory: str) -> Dict[str, os.DirEntry]:
+        entries = self._scanned.get(directory)
+        if entries is None:
+            try:
+                with trace_span("scandir", path=os.path.relpath(directory, self.root)):
+                    with os.scandir(directory) as it:
+                        entries = {entry.name: entry for entry in it}
+            except OSError:
+                entries = {}
+            self._scanned[directory] = entries
+        return entries
+
+    def lookup(self, path: str) -> Tuple[bool, Optional[Tuple[int, int, int]]]:
+        """(스냅샷이 다루는 경로인지, 파일 지문) 반환"""
+        path = os.path.abspath(path)
+        directory = os.path.dirname(path)
+        if (directory != self.root and directory != self.docs) or path in self._stale:
+            return False, None
+        entry = self._scan(directory).get(os.path.basename(path))
+        if entry is None:
+            return True, None
+        try:
+            st = entry.stat()
+        except OSError:
+            return True, None
+        return True, (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def is_dir(self, path: str) -> bool:
+        """루트 바로 아래 디렉토리 존재 여부"""
+        path = os.path.abspath(path)
+        if os.path.dirname(path) != self.root or path in self._stale:
+            return os.path.isdir(path)
+        entry = self._scan(self.root).get(os.path.basename(path))
+        return entry is not None and entry.is_dir()
+
+    def invalidate(self, path: str) -> None:
+        """요청 중 바뀐 경로 표시"""
+        path = os.path.abspath(path)
+        self._stale.add(path)
+        self._scanned.pop(path, None)
+
+# 현재 요청의 작업 공간 스냅샷 (workspace_tool이 요청마다 설정)
+_request_snapshot: ContextVar[Optional[WorkspaceSnapshot]] = ContextVar("request_snapshot", default=None)
+
+def _invalidate_snapshot(file_path: str) -> None:
+    snapshot = _request_snapshot.get()
+    if snapshot is not None:
+        snapshot.invalidate(file_path)
+
+def invalidate_file(file_path: str) -> None:
+    """파일을 직접 바꾼 뒤 요청 스냅샷, 지문 캐시, 응답 캐시, 계획 캐시에서 해당 경로 무효화
+
+    이 쓰기로 쌓인 inotify 이벤트는 여기서 읽어 버려서, 호출한 쪽이 다시 넣어 두는
+    계획 모델이 다음 요청에서 외부 편집으로 오인되어 버려지지 않게 한다.
+    """
+    path = os.path.abspath(file_path)
+    _invalidate_snapshot(file_path)
+    _workspace_watcher.poll(own_path=path)
+    _workspace_watcher.invalidate(path)
+    _response_cache.invalidate(file_path)
+    # 같은 크기로 덮어쓰면 지문이 그대로일 수 있으므로 이 파일로 만든 모델도 버린다
+    # (제목 역색인은 모델 객체가 바뀌면 다시 동기화된다)
+    _plan_models.pop(path, None)
+    _plan_shards.pop(path, None)
+
+def _drop_plan_caches(path: Optional[str] = None) -> None:
+    """경로(생략 시 전체)의 파일로 만든 계획 모델, 분할 매니페스트, 제목 역색인 제거
+
+    이 캐시들은 stat 지문으로 파일 변경을 확인하므로 크기·수정 시각·inode를 그대로 둔
+    편집은 놓친다. inotify가 변경을 알려 주면 지문과 상관없이 버린다.
+    """
+    if path is None:
+        _plan_models.clear()
+        _plan_shards.clear()
+        _title_indexes.clear()
+        return
+    _plan_models.pop(path, None)
+    _plan_shards.pop(path, None)
+    _title_indexes.pop(path, None)
+
+def _stat_fingerprint(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """stat으로 파일 지문 (mtime_ns, size, inode) 계산, 파일이 없으면 None
+
+    요청 범위의 작업 공간 스냅샷이 있으면 그 결과를 사용한다.
+    """
+    snapshot = _request_snapshot.get()
+    if snapshot is not None:
+        found, fingerprint = snapshot.lookup(file_path)
+        if found:
+            return fingerprint
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def file_fingerprint(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """파일 지문 (mtime_ns, size, inode) 반환, 파일이 없으면 None
+
+    감시 중인 디렉토리의 파일은 변경 이벤트가 오기 전까지 기억해 둔 지문을 재사용한다.
+    """
+    return _workspace_watcher.fingerprint(os.path.abspath(file_path))
+
+class ResponseCache:
+    """읽기 전용 도구 응답 캐시
+
+    (도구, 인자, 도구가 읽은 파일들의 지문)을 키로 사용하는 LRU 캐시.
+    파일이 바뀌면 지문이 달라지므로 자동으로 미스가 나고,
+    save_to_file을 통한 쓰기는 해당 경로의 항목을 즉시 무효화한다.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable, Fingerprints], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(file_paths) -> Fingerprints:
+        """파일 목록의 (절대 경로, 지문) 튜플 생성"""
+        _workspace_watcher.poll()
+        return tuple(
+            (os.path.abspath(file_path), file_fingerprint(file_path))
+            for file_path in file_paths
+        )
+
+    def get(self, tool: str, args: Hashable, fingerprints: Fingerprints) -> Optional[Any]:
+        """캐시된 응답 조회, 없으면 None"""
+        key = (tool, args, fingerprints)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, tool: str, args: Hashable, fingerprints: Fingerprints, value: Any) -> None:
+        """응답 저장 (가장 오래 사용되지 않은 항목부터 제거)"""
+        key = (tool, args, fingerprints)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, file_path: str) -> None:
+        """해당 파일을 읽은 모든 항목 제거"""
+        path = os.path.abspath(file_path)
+        with self._lock:
+            stale = [key for key in self._entries if any(p == path for p, _ in key[2])]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """모든 항목 제거"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률 등 캐시 지표 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+_response_cache = ResponseCache()
+
+class WorkspaceWatcher:
+    """작업 공간 변경 감시 (Linux inotify)
+
+    작업 공간 루트(claude.md)와 docs/ 디렉토리를 감시하여 에디터 등 외부에서
+    파일이 바뀌면 지문 캐시와 응답 캐시를 무효화한다. 이벤트는 별도 스레드 없이
+    조회 직전에 논블로킹 read 한 번으로 처리한다. inotify를 쓸 수 없거나
+    감시 개수 한도에 도달한 디렉토리는 매번 stat으로 확인한다.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+                  | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, enabled: bool = WATCH_ENABLED):
+        self._lock = threading.RLock()
+        self._fd = -1
+        self._libc = None
+        self._dirs: Dict[int, str] = {}         # watch descriptor -> 디렉토리
+        self._watched: Dict[str, int] = {}      # 디렉토리 -> watch descriptor
+        self._roots: set = set()
+        self._fingerprints: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        if enabled and sys.platform.startswith("linux"):
+            self._init_inotify()
+
+    @property
+    def active(self) -> bool:
+        return self._fd >= 0
+
+    def _init_inotify(self) -> None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd >= 0:
+            self._libc = libc
+            self._fd = fd
+
+    def _add_watch(self, directory: str) -> None:
+        if directory in self._watched or not os.path.isdir(directory):
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            # ENOSPC(감시 한도 초과) 등: 이 디렉토리는 stat 방식으로 확인
+            return
+        self._dirs[wd] = directory
+        self._watched[directory] = wd
+
+    def watch_workspace(self, root: str) -> None:
+        """작업 공간 루트와 docs/ 디렉토리 감시 등록"""
+        with self._lock:
+            if not self.active or root in self._roots:
+                return
+            self._roots.add(root)
+            self._add_watch(root)
+            self._add_watch(os.path.join(root, str(DOCS_DIR)))
+
+    def fingerprint(self, path: str) -> Optional[Tuple[int, int, int]]:
+        """감시 중인 디렉토리면 기억해 둔 지문, 아니면 stat 결과 반환"""
+        if not self.active:
+            return _stat_fingerprint(path)
+        with self._lock:
+            if path in self._fingerprints:
+                return self._fingerprints[path]
+            fingerprint = _stat_fingerprint(path)
+            if os.path.dirname(path) in self._watched:
+                self._fingerprints[path] = fingerprint
+            return fingerprint
+
+    def invalidate(self, path: str) -> None:
+        """기억해 둔 지문 제거"""
+        with self._lock:
+            self._fingerprints.pop(path, None)
+
+    def clear(self) -> None:
+        """기억해 둔 지문 전체 제거"""
+        with self._lock:
+            self._fingerprints.clear()
+
+    def poll(self, own_path: Optional[str] = None) -> None:
+        """쌓인 inotify 이벤트를 읽어 캐시 무효화
+
+        own_path는 방금 직접 쓴 파일로, 그 이벤트로는 계획 캐시를 버리지 않는다.
+        """
+        if not self.active:
+            return
+        with self._lock:
+            self.watch_workspace(os.getcwd())
+            while True:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    return
+                except OSError as e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    raise
+                self._handle_events(data, own_path)
+
+    def _handle_events(self, data: bytes, own_path: Optional[str] = None) -> None:
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # 이벤트 유실 - 모두 무효화
+                self._fingerprints.clear()
+                _response_cache.clear()
+                _drop_plan_caches()
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & (self.IN_IGNORED | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                self._drop_directory(wd, directory)
+                continue
+
+            path = os.path.join(directory, name)
+            self._fingerprints.pop(path, None)
+            _response_cache.invalidate(path)
+            if path != own_path:
+                _drop_plan_caches(path)
+            if mask & self.IN_ISDIR:
+                # docs/ 디렉토리가 새로 생기거나 사라진 경우
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and directory in self._roots:
+                    self._add_watch(path)
+                self._forget_directory(path)
+
+    def _forget_directory(self, directory: str) -> None:
+        for path in [p for p in self._fingerprints if os.path.dirname(p) == directory]:
+            del self._fingerprints[path]
+            _response_cache.invalidate(path)
+        # 분할 계획의 대분류 파일처럼 더 아래에 있는 파일의 캐시도 함께 버린다
+        prefix = directory + os.sep
+        for path in [p for cache in (_plan_models, _plan_shards, _title_indexes) for p in cache if p.startswith(prefix)]:
+            _drop_plan_caches(path)
+
+    def _drop_directory(self, wd: int, directory: str) -> None:
+        self._dirs.pop(wd, None)
+        if self._watched.get(directory) == wd:
+            del self._watched[directory]
+        self._forget_directory(directory)
+
+_workspace_watcher = WorkspaceWatcher()
+
+class ProjectLane:
+    """프로젝트 하나의 실행 슬롯과 대기열"""
+
+    __slots__ = ("active", "waiters")
+
+    def __init__(self):
+        self.active = 0
+        self.waiters: deque = deque()
+
+class AdmissionControl:
+    """프로젝트별 요청 수락 제어
+
+    작업 공간마다 동시에 실행하는 요청 수를 concurrency로, 슬롯을 기다리는 요청 수를
+    queue_depth로 제한한다. 대기열이 가득 차면 기다리지 않고 과부하 응답을 돌려주어
+    한 프로젝트의 폭주가 같은 서버의 다른 프로젝트 지연 시간으로 번지지 않게 한다.
+    같은 읽기 요청(도구 이름과 인자가 같은 요청)이 이미 대기 중이거나 실행 중이면
+    새로 줄을 서지 않고 그 결과를 함께 받는다 (single-flight). 병합 확인은 대기열
+    한도 확인보다 먼저 하므로 함께 받는 요청은 대기열 자리를 차지하지 않는다.
+
+    대기열은 이벤트 루프의 Future로 구현하며 한가해진 프로젝트의 상태는 바로 지워서
+    작업자 프로세스처럼 asyncio.run을 여러 번 호출하는 경우에도 루프가 섞이지 않는다.
+    """
+
+    def __init__(self, concurrency: int, queue_depth: int):
+        self.concurrency = max(1, concurrency)
+        self.queue_depth = max(0, queue_depth)
+        self._lanes: Dict[str, ProjectLane] = {}
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.admitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def run(self, project: str, key: Optional[Hashable], call):
+        """call()을 프로젝트 대기열을 거쳐 실행 - key가 같은 진행 중 요청이 있으면 결과 공유"""
+        while key is not None and key in self._flights:
+            flight = self._flights[key]
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # 먼저 온 요청만 취소된 경우 직접 실행
+        
+        flight = None
+        if key is not None:
+            flight = asyncio.get_running_loop().create_future()
+            self._flights[key] = flight
+        try:
+            result = await self._admit(project, call)
+        except BaseException as e:
+            if flight is not None:
+                if isinstance(e, asyncio.CancelledError):
+                    flight.cancel()
+                else:
+                    flight.set_exception(e)
+                    # 함께 기다린 요청이 없어도 경고가 나지 않도록 예외를 확인 처리
+                    flight.exception()
+            raise
+        else:
+            if flight is not None:
+                flight.set_result(result)
+            return result
+        finally:
+            if flight is not None:
+                del self._flights[key]
+
+    async def _admit(self, project: str, call):
+        lane = self._lanes.get(project)
+        if lane is None:
+            lane = self._lanes[project] = ProjectLane()
+        if lane.active < self.concurrency:
+            lane.active += 1
+        elif len(lane.waiters) >= self.queue_depth:
+            self.rejected += 1
+            return (f"❌ 서버가 바쁩니다: 이 프로젝트에서 처리 중이거나 대기 중인 요청이 너무 많습니다 "
+                    f"(동시 실행 {self.concurrency}개, 대기 {self.queue_depth}개). 잠시 후 다시 시도하세요.")
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            lane.waiters.append(waiter)
+            try:
+                with trace_span("admission_wait", queued=len(lane.waiters)):
+                    await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # 슬롯을 넘겨받은 직후 취소되면 다음 요청에 넘긴다
+                    self._release(project, lane)
+                else:
+                    lane.waiters.remove(waiter)
+                raise
+        self.admitted += 1
+        try:
+            return await call()
+        finally:
+            self._release(project, lane)
+
+    def _release(self, project: str, lane: ProjectLane) -> None:
+        """슬롯 반납 - 대기 중인 요청이 있으면 슬롯을 그대로 넘긴다"""
+        while lane.waiters:
+            waiter = lane.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        lane.active -= 1
+        if lane.active == 0 and self._lanes.get(project) is lane:
+            del self._lanes[project]
+
+    def stats(self) -> Dict[str, Any]:
+        """수락·병합·거절 횟수와 프로젝트별 실행/대기 수 반환"""
+        return {
+            "admitted": self.admitted,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "projects": {
+                project: {"active": lane.active, "queued": len(lane.waiters)}
+                for project, lane in self._lanes.items()
+            },
+        }
+
+_admission = AdmissionControl(ADMISSION_CONCURRENCY, ADMISSION_QUEUE_DEPTH)
+
+def _coalesce_key(project: str, name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """같은 읽기 요청 판별 키 - 요청 컨텍스트(진행 알림 대상)는 제외"""
+    arguments = {key: value for key, value in kwargs.items() if not isinstance(value, Context)}
+    return json.dumps([project, name, args, arguments], sort_keys=True, default=str)
+
+# 도구 이름 -> 등록된 도구 함수 (batch 명령은 MCP 전송 없이 직접 호출)
+_tools: Dict[str, Any] = {}
+
+def workspace_tool(name: str, coalesce: bool = False):
+    """MCP 도구 등록 데코레이터 - 요청마다 작업 공간 스냅샷 범위를 연다
+
+    다른 도구 안에서 호출되면 (예: task-resume → task-start) 바깥 요청의 스냅샷을 그대로 쓴다.
+    바깥 요청은 프로젝트별 수락 제어(AdmissionControl)를 거치며, coalesce=True인
+    읽기 전용 도구는 동시에 들어온 같은 요청을 한 번만 실행한다.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with trace_request(name):
+                if _request_snapshot.get() is not None:
+                    return await fn(*args, **kwargs)
+                
+                project = os.getcwd()
+                
+                async def call():
+                    token = _request_snapshot.set(WorkspaceSnapshot(project))
+                    try:
+                        recover_interrupted_restore()
+                        return await fn(*args, **kwargs)
+                    finally:
+                        _request_snapshot.reset(token)
+                
+                key = _coalesce_key(project, name, args, kwargs) if coalesce else None
+                return await _admission.run(project, key, call)
+        mcp.tool(name=name)(wrapper)
+        _tools[name] = wrapper
+        return wrapper
+    return decorator
+
+async def report_phase(ctx: Optional[Context], step: int, total: int, message: str) -> None:
+    """단계 경계에서 진행 상황을 알리고 취소 확인 지점을 둔다
+
+    요청이 취소되었으면 여기서 CancelledError가 발생하므로, 이 호출 뒤에 시작하는
+    쓰기 단계는 await 없이 끝까지 실행해야 디스크에 이전/새 상태 중 하나만 남는다.
+    """
+    if ctx is not None:
+        await ctx.report_progress(step, total, message)
+    await asyncio.sleep(0)
+
 def ensure_docs_dir():
     """docs 디렉토리가 존재하는지 확인하고 없으면 생성"""
+    snapshot = _request_snapshot.get()
+    if snapshot is not None and snapshot.is_dir(str(DOCS_DIR)):
+        return
     DOCS_DIR.mkdir(exist_ok=True)
+    _invalidate_snapshot(str(DOCS_DIR))
 
 def check_file_exists(file_path: str) -> bool:
     """파일 존재 여부 확인"""
-    return Path(file_path).exists()
+    _workspace_watcher.poll()
+    return file_fingerprint(file_path) is not None
 
 def save_to_file(file_path: str, content: str) -> None:
-    """파일에 내용 저장"""
-    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    """파일에 내용 저장
+
+    같은 디렉토리의 임시 파일에 쓴 뒤 교체하므로, 중간에 중단되어도 파일에는
+    이전 내용이나 새 내용 중 하나만 남는다.
+    """
+    with trace_span("save_to_file", path=file_path):
+        target = Path(file_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, target)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+    invalidate_file(file_path)
+
+def delete_file(file_path: str) -> None:
+    """파일 삭제 (없으면 무시)"""
+    if Path(file_path).exists():
+        Path(file_path).unlink()
+    invalidate_file(file_path)
 
 def load_from_file(file_path: str) -> str:
     """파일에서 내용 로드"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
+    if _request_snapshot.get() is not None and file_fingerprint(file_path) is None:
+        # 스냅샷에 없는 파일은 열어 보지 않는다
         return ""
+    with trace_span("load_from_file", path=file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
 
-@mcp.tool(name="task-new")
-async def task_new() -> str:
+def load_doc_hashes() -> Dict[str, Any]:
+    """생성 문서 해시 기록 로드 - 경로 -> {"sha256", "fingerprint", "racy"}"""
+    try:
+        return json.loads(load_from_file(DOC_HASHES_FILE) or "{}")
+    except json.JSONDecodeError:
+        return {}
+
+def _record_doc_hash(hashes: Dict[str, Any], file_path: str, digest: str,
+                     fingerprint: Optional[Tuple[int, int, int]]) -> None:
+    # 방금 수정된 파일은 같은 시각 안에 다시 바뀌어도 지문이 같을 수 있으므로 한 번 더 읽어 확인하도록 표시
+    racy = fingerprint is None or time.time_ns() - fingerprint[0] < SNAPSHOT_RACY_WINDOW_NS
+    hashes[file_path] = {"sha256": digest, "fingerprint": list(fingerprint or ()), "racy": racy}
+
+def save_if_changed(file_path: str, content: str, hashes: Dict[str, Any]) -> bool:
+    """내용이 기존 파일과 다를 때만 저장 - 저장했으면 True
+
+    기록된 지문이 현재 파일 지문과 같으면 기존 파일을 읽지 않고 기록된 해시와 비교한다.
+    내용이 같으면 파일을 건드리지 않으므로 수정 시각과 캐시·감시 상태가 그대로 유지된다.
+    """
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    fingerprint = file_fingerprint(file_path)
+    if fingerprint is not None:
+        stored = hashes.get(file_path)
+        if stored is not None and stored["fingerprint"] == list(fingerprint) and not stored.get("racy"):
+            current = stored["sha256"]
+        else:
+            with trace_span("hash", path=file_path):
+                with open(file_path, 'rb') as f:
+                    current = hashlib.sha256(f.read()).hexdigest()
+        if current == digest:
+            _record_doc_hash(hashes, file_path, digest, fingerprint)
+            return False
+    save_to_file(file_path, content)
+    _record_doc_hash(hashes, file_path, digest, file_fingerprint(file_path))
+    return True
+
+def missing_prerequisites(required: Dict[str, str]) -> List[str]:
+    """필수 파일 확인 - 없는 파일들의 오류 메시지 목록 반환
+
+    파일 지문을 그대로 존재 여부로 사용하므로 응답 캐시 검증과 같은 stat 결과를 공유한다.
+    """
+    fingerprints = _response_cache.fingerprint(required)
+    return [
+        f"❌ {error_msg}"
+        for (_, fingerprint), error_msg in zip(fingerprints, required.values())
+        if fingerprint is None
+    ]
+
+# 마크다운 제목 줄과 코드 블록 경계 (코드 블록 안의 "#"은 제목이 아니다)
+HEADING_LINE = re.compile(rb"^(?:(#{1,6})[ \t]+(.*?)[ \t#]*|[ \t]*(```|~~~).*?)\r?$", re.MULTILINE)
+
+class SpecDocument:
+    """요구사항 문서 지연 핸들
+
+    처음 내용에 접근할 때 파일을 mmap으로 열고, 전체 텍스트나 절(section) 단위로
+    필요한 부분만 디코딩한다. 접근하지 않은 문서는 열지도 않는다.
+    제목 색인은 처음 절을 찾을 때 한 번 만든다 (제목 줄 위치만 기록).
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._data: Optional[Any] = None
+        self._text: Optional[str] = None
+        # (수준, 제목, 제목 줄 시작, 본문 시작)
+        self._headings: Optional[List[Tuple[int, str, int, int]]] = None
+
+    def __enter__(self) -> "SpecDocument":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def data(self):
+        """문서 바이트 (mmap, 빈 파일이나 없는 파일은 b"")"""
+        if self._data is None:
+            with trace_span("mmap", path=self.file_path):
+                try:
+                    self._file = open(self.file_path, 'rb')
+                except FileNotFoundError:
+                    self._data = b""
+                    return self._data
+                try:
+                    self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._data = self._map
+                except ValueError:
+                    # 빈 파일은 매핑할 수 없다
+                    self._data = b""
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def text(self) -> str:
+        """문서 전체 텍스트 (처음 접근할 때 디코딩)"""
+        if self._text is None:
+            self._text = self.data[:].decode("utf-8")
+        return self._text
+
+    def headings(self) -> List[Tuple[int, str]]:
+        """(수준, 제목) 목록"""
+        return [(level, title) for level, title, _, _ in self._index()]
+
+    def section(self, title: str) -> Optional[str]:
+        """제목이 title인 절의 본문 (다음 같은 수준 이상의 제목 전까지), 없으면 None"""
+        headings = self._index()
+        for i, (level, heading, _, body_start) in enumerate(headings):
+            if heading != title.strip():
+                continue
+            end = len(self.data)
+            for next_level, _, next_start, _ in headings[i + 1:]:
+                if next_level <= level:
+                    end = next_start
+                    break
+            return self.data[body_start:end].decode("utf-8").strip("\r\n")
+        return None
+
+    def _index(self) -> List[Tuple[int, str, int, int]]:
+        if self._headings is None:
+            headings = []
+            in_fence = False
+            for match in HEADING_LINE.finditer(self.data):
+                if match.group(3):
+                    in_fence = not in_fence
+                elif not in_fence:
+                    headings.append((len(match.group(1)), match.group(2).decode("utf-8").strip(),
+                                     match.start(), match.end()))
+            self._headings = headings
+        return self._headings
+
+    def close(self) -> None:
+        """매핑과 파일 닫기"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = None
+
+# 작업 줄 형식: "[ ] 1. 제목", "- [ ] 1.1. 제목", "  - [ ] 1.1.1. 제목"
+TASK_LINE = re.compile(rb"^[ \t]*(?:- )?\[([ x-])\] (\d+(?:\.\d+)*)\.[ \t]*([^\r\n]*)\r?$", re.MULTILINE)
+
+class PlanModel:
+    """project_task.md를 파싱한 작업 계획 모델
+
+    작업은 문서 순서대로 번호가 매겨지고, 필드별로 같은 번호로 인덱싱되는 배열에
+    저장된다 (struct-of-arrays). 상태와 단계는 작업당 1바이트, 상위 작업·하위 범위·
+    파일 오프셋은 array('I'/'i')이며, 작업 ID와 제목은 하나의 UTF-8 바이트열에 이어
+    붙여 오프셋으로 잘라 쓴다. 작업마다 파이썬 객체를 만들지 않으므로 큰 계획도
+    작업당 수십 바이트로 메모리에 유지할 수 있다.
+
+    상태별 작업 수는 에픽(대분류) 단위와 전체로 관리하며, 상태가 바뀔 때마다
+    set_status에서 증분 갱신하므로 조회 시 계획 전체를 다시 훑지 않는다.
+    """
+
+    def __init__(self, content: bytes):
+        self.levels = bytearray()           # 1: 대분류, 2: 중분류, 3: 소분류
+        self.statuses = bytearray()         # 상태 문자 (TASK_STATUSES 키의 바이트 값)
+        self.parents = array("i")           # 상위 작업 번호 (최상위는 -1)
+        self.epics = array("I")             # 소속 대분류 번호 (대분류는 자기 자신)
+        self.ends = array("I")              # 하위 작업 범위의 끝 (다음 형제 작업 번호)
+        self.offsets = array("I")           # 상태 문자의 파일 내 바이트 위치
+        self.child_counts = array("I")      # 직속 하위 작업 수
+        self.done_children = array("I")     # 완료된 직속 하위 작업 수
+        self.in_progress: set = set()       # 진행중 작업 번호
+        # 대분류별/전체 하위 작업 상태 카운터 (대분류 자신은 제외)
+        self.epic_counts: Dict[int, Dict[str, int]] = {}
+        self.totals: Dict[str, int] = dict.fromkeys(TASK_STATUSES, 0)
+        self._next_pending = 0
+
+        # 작업 ID와 제목은 바이트열 하나에 이어 붙이고 시작 위치만 기록
+        id_blob, title_blob = bytearray(), bytearray()
+        self._id_offsets = array("I", [0])
+        self._title_offsets = array("I", [0])
+
+        # 전체 문서에서 작업 줄만 정규식으로 찾는다 (지역 변수 바인딩은 대용량 계획 파싱 속도용)
+        levels, statuses, parents, epics, ends = self.levels, self.statuses, self.parents, self.epics, self.ends
+        child_counts, done_children, in_progress = self.child_counts, self.done_children, self.in_progress
+        append_level, append_parent, append_epic = levels.append, parents.append, epics.append
+        append_end, append_offset = ends.append, self.offsets.append
+        append_child_count, append_done_children = child_counts.append, done_children.append
+        append_id_offset, append_title_offset = self._id_offsets.append, self._title_offsets.append
+        epic_indices: List[int] = []
+        stack: List[int] = []
+        task_index = 0
+        for match in TASK_LINE.finditer(content):
+            status, task_id, title = match.groups()
+            level = task_id.count(b".") + 1
+
+            while stack and levels[stack[-1]] >= level:
+                ends[stack.pop()] = task_index
+            parent = stack[-1] if stack else -1
+            stack.append(task_index)
+
+            append_level(level)
+            statuses += status
+            append_parent(parent)
+            append_end(task_index + 1)
+            append_offset(match.start(1))
+            append_child_count(0)
+            append_done_children(0)
+            id_blob += task_id
+            title_blob += title
+            append_id_offset(len(id_blob))
+            append_title_offset(len(title_blob))
+            if status == b"-":
+                in_progress.add(task_index)
+
+            if parent < 0:
+                append_epic(task_index)
+                epic_indices.append(task_index)
+            else:
+                append_epic(epics[parent])
+                child_counts[parent] += 1
+                if status == b"x":
+                    done_children[parent] += 1
+            task_index += 1
+        for open_index in stack:
+            ends[open_index] = task_index
+
+        # 대분류의 하위 작업은 문서에서 연속된 범위이므로 상태 바이트를 한 번에 센다
+        status_bytes = [(status, status.encode("ascii")) for status in TASK_STATUSES]
+        for epic in epic_indices:
+            segment = statuses[epic + 1:ends[epic]]
+            counts = self.epic_counts[epic] = {status: segment.count(code) for status, code in status_bytes}
+            for status, count in counts.items():
+                self.totals[status] += count
+
+        self._id_blob = bytes(id_blob)
+        self._title_blob = bytes(title_blob)
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def task_id(self, task_index: int) -> str:
+        """작업 ID ("1.1.2")"""
+        offsets = self._id_offsets
+        return self._id_blob[offsets[task_index]:offsets[task_index + 1]].decode("ascii")
+
+    def title(self, task_index: int) -> str:
+        """작업 제목"""
+        offsets = self._title_offsets
+        return self._title_blob[offsets[task_index]:offsets[task_index + 1]].decode("utf-8", errors="replace")
+
+    def titles(self):
+        """문서 순서대로 모든 작업 제목 생성"""
+        return (self.title(task_index) for task_index in range(len(self)))
+
+    def status(self, task_index: int) -> str:
+        """작업 상태 문자 (TASK_STATUSES 키)"""
+        return chr(self.statuses[task_index])
+
+    def find(self, task_id: str) -> Optional[int]:
+        """작업 ID로 작업 번호 찾기 - 형제 작업을 따라 내려가므로 O(깊이 × 형제 수)"""
+        target = task_id.encode("ascii", errors="replace")
+        task_index, end = 0, len(self)
+        while task_index < end:
+            current = self._id_blob[self._id_offsets[task_index]:self._id_offsets[task_index + 1]]
+            if current == target:
+                return task_index
+            if target.startswith(current + b"."):
+                task_index, end = task_index + 1, self.ends[task_index]
+            else:
+                task_index = self.ends[task_index]
+        # 번호 체계가 어긋난 문서는 전체에서 찾는다
+        for task_index in range(len(self)):
+            if self.task_id(task_index) == task_id:
+                return task_index
+        return None
+
+    def label(self, task_index: int) -> str:
+        """작업 표시 문자열 ("1.1. 제목")"""
+        return f"{self.task_id(task_index)}. {self.title(task_index)}"
+
+    def render(self, task_index: int) -> str:
+        """project_task.md 형식의 작업 줄 ("- [ ] 1.1. 제목")"""
+        level = self.levels[task_index]
+        bullet = "" if level == 1 else "  " * (level - 2) + "- "
+        return f"{bullet}[{self.status(task_index)}] {self.label(task_index)}"
+
+    def set_status(self, task_index: int, status: str) -> None:
+        """작업 상태 변경 및 카운터 증분 갱신"""
+        old = self.status(task_index)
+        if old == status:
+            return
+        self.statuses[task_index] = ord(status)
+        parent = self.parents[task_index]
+        if parent >= 0:
+            counts = self.epic_counts[self.epics[task_index]]
+            counts[old] -= 1
+            counts[status] += 1
+            self.totals[old] -= 1
+            self.totals[status] += 1
+            if status == "x":
+                self.done_children[parent] += 1
+            elif old == "x":
+                self.done_children[parent] -= 1
+        if status == "-":
+            self.in_progress.add(task_index)
+        else:
+            self.in_progress.discard(task_index)
+        if status == " ":
+            self._next_pending = min(self._next_pending, task_index)
+
+    def next_pending(self) -> Optional[int]:
+        """문서 순서상 첫 번째 대기중 작업 번호"""
+        task_index = self.statuses.find(b" ", self._next_pending)
+        if task_index < 0:
+            self._next_pending = len(self)
+            return None
+        self._next_pending = task_index
+        return task_index
+
+    def current(self) -> Optional[int]:
+        """문서 순서상 첫 번째 진행중 작업 번호"""
+        return min(self.in_progress) if self.in_progress else None
+
+    def current_leaf(self) -> Optional[int]:
+        """가장 최근에 시작된(문서 순서상 마지막) 진행중 작업 번호"""
+        return max(self.in_progress) if self.in_progress else None
+
+    def completion_changes(self, task_index: int) -> Dict[int, str]:
+        """작업 완료 시 바뀌는 상태 - 하위 작업이 모두 끝난 상위 작업까지 완료 처리
+
+        완료 경로의 상위 작업만 확인하므로 계획 크기와 무관하게 O(깊이)이다.
+        """
+        changes = {task_index: "x"}
+        parent = self.parents[task_index]
+        while parent >= 0 and self.status(parent) != "x":
+            if self.done_children[parent] + 1 < self.child_counts[parent]:
+                break
+            changes[parent] = "x"
+            parent = self.parents[parent]
+        return changes
+
+# 파일 경로 -> (지문, 계획 모델), 최근 사용 순 (PLAN_MODEL_CACHE_SIZE개까지)
+_plan_models: "OrderedDict[str, Tuple[Optional[Tuple[int, int, int]], PlanModel]]" = OrderedDict()
+
+def _cache_plan_model(path: str, fingerprint: Optional[Tuple[int, int, int]], model: PlanModel) -> None:
+    """계획 모델 저장 - 가장 오래 사용되지 않은 모델부터 그 제목 역색인과 함께 제거"""
+    _plan_models[path] = (fingerprint, model)
+    _plan_models.move_to_end(path)
+    while len(_plan_models) > PLAN_MODEL_CACHE_SIZE:
+        evicted, _ = _plan_models.popitem(last=False)
+        _title_indexes.pop(evicted, None)
+
+def load_plan_model(file_path: str = PLAN_FILE) -> Optional[PlanModel]:
+    """작업 계획 모델 로드 - 파일이 바뀌지 않았으면 메모리의 모델 재사용, 없으면 None"""
+    _workspace_watcher.poll()
+    path = os.path.abspath(file_path)
+    fingerprint = file_fingerprint(path)
+    if fingerprint is None:
+        _plan_models.pop(path, None)
+        return None
+    cached = _plan_models.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        _plan_models.move_to_end(path)
+        return cached[1]
+    with trace_span("load_from_file", path=file_path):
+        with open(path, 'rb') as f:
+            data = f.read()
+    with trace_span("parse", path=file_path):
+        model = PlanModel(data)
+    _cache_plan_model(path, fingerprint, model)
+    return model
+
+# 단어 단위 토큰 (한글 포함)
+WORD_PATTERN = re.compile(r"\w+")
+# 검색 상태 필터 별칭
+STATUS_ALIASES = {
+    "pending": " ", "대기중": " ", " ": " ",
+    "in_progress": "-", "진행중": "-", "-": "-",
+    "done": "x", "완료": "x", "x": "x",
+}
+
+class TitleIndex:
+    """작업 제목 역색인
+
+    제목(소문자)의 1·2글자 n-gram과 단어 토큰을 색인한다. 제목마다 번호를 붙이고
+    게시 목록은 제목 번호를 오름차순으로 담은 array('I')로 두어, 작업 번호가 아니라
+    제목을 가리키므로 계획이 다시 파싱되어 작업 번호가 밀려도 새로 생긴 제목만
+    목록 끝에 덧붙이면 된다. 사라진 제목은 번호만 비워 두었다가 (조회 시 건너뜀)
+    빈 번호가 살아 있는 제목보다 많아지면 색인을 다시 만든다. 제목 번호 → 작업 번호는
+    CSR 형태의 배열 두 개로 둔다. 상태는 색인하지 않고 조회 시점의 모델 값을
+    사용하므로 상태 변경 시 색인 갱신이 필요 없다.
+    """
+
+    def __init__(self):
+        self.model: Optional[PlanModel] = None
+        self._ids: Dict[str, int] = {}              # 제목(소문자) -> 제목 번호
+        self._texts: List[Optional[str]] = []       # 제목 번호 -> 제목(소문자), 사라진 제목은 None
+        self._grams: Dict[str, array] = {}          # n-gram -> 제목 번호들
+        self._words: Dict[str, array] = {}          # 단어 -> 제목 번호들
+        self._sorted_words: Optional[List[str]] = []  # 접두사 검색용 정렬된 단어 목록 (None이면 다시 정렬)
+        self._dead = 0
+        self._task_offsets = array('I')             # 제목 번호 -> _task_indices 범위
+        self._task_indices = array('I')
+        self._lock = threading.Lock()               # 작업자 스레드의 동기화와 조회를 직렬화
+
+    def _reset(self) -> None:
+        self._ids, self._texts, self._grams, self._words = {}, [], {}, {}
+        self._sorted_words, self._dead = [], 0
+
+    def _add(self, text: str) -> None:
+        """새 제목 번호를 붙이고 게시 목록 끝에 추가 (번호가 가장 크므로 정렬 유지)"""
+        title_id = len(self._texts)
+        self._ids[text] = title_id
+        self._texts.append(text)
+        grams, words = self._grams, self._words
+        for gram in {*text, *map(str.__add__, text, text[1:])}:
+            postings = grams.get(gram)
+            if postings is None:
+                postings = grams[gram] = array('I')
+            postings.append(title_id)
+        for word in set(WORD_PATTERN.findall(text)):
+            postings = words.get(word)
+            if postings is None:
+                postings = words[word] = array('I')
+                self._sorted_words = None
+            postings.append(title_id)
+
+    def _assign(self, texts: List[str]) -> array:
+        """작업별 제목 번호 - 새 제목은 색인에 추가하고 사라진 제목은 번호를 비운다"""
+        ids = self._ids
+        task_titles = array('I', [0]) * len(texts)
+        for task_index, text in enumerate(texts):
+            title_id = ids.get(text)
+            if title_id is None:
+                self._add(text)
+                title_id = len(self._texts) - 1
+            task_titles[task_index] = title_id
+        live = set(task_titles)
+        for title_id, text in enumerate(self._texts):
+            if text is not None and title_id not in live:
+                del ids[text]
+                self._texts[title_id] = None
+                self._dead += 1
+        return task_titles
+
+    def sync(self, model: PlanModel) -> None:
+        """모델의 제목 목록에 맞춰 바뀐 제목만 색인에 반영"""
+        with self._lock:
+            if self.model is not model:
+                self._sync(model)
+
+    def _sync(self, model: PlanModel) -> None:
+        texts = [title.lower() for title in model.titles()]
+        task_titles = self._assign(texts)
+        if self._dead > len(self._ids):
+            # 빈 번호가 살아 있는 제목보다 많으면 게시 목록을 새로 만든다
+            self._reset()
+            task_titles = self._assign(texts)
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self._words)
+        
+        # 제목 번호 순으로 작업 번호를 모은 CSR 배열 (같은 제목 안에서는 문서 순서)
+        counts = [0] * (len(self._texts) + 1)
+        for title_id in task_titles:
+            counts[title_id + 1] += 1
+        for title_id in range(len(self._texts)):
+            counts[title_id + 1] += counts[title_id]
+        self._task_offsets = array('I', counts)
+        self._task_indices = array('I', sorted(range(len(texts)), key=task_titles.__getitem__))
+        self.model = model
+
+    def _match_substring(self, term: str) -> set:
+        grams = [term] if len(term) == 1 else [term[i:i + 2] for i in range(len(term) - 1)]
+        postings = sorted((self._grams.get(gram, ()) for gram in grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        texts = self._texts
+        return {title_id for title_id in candidates if texts[title_id] is not None and term in texts[title_id]}
+
+    def _match_prefix(self, term: str) -> set:
+        title_ids: Optional[set] = None
+        for word in WORD_PATTERN.findall(term) or [term]:
+            matched: set = set()
+            start = bisect.bisect_left(self._sorted_words, word)
+            for candidate in self._sorted_words[start:]:
+                if not candidate.startswith(word):
+                    break
+                matched.update(self._words.get(candidate, ()))
+            title_ids = matched if title_ids is None else title_ids & matched
+        texts = self._texts
+        return {title_id for title_id in title_ids or () if texts[title_id] is not None}
+
+    def search(self, query: str, prefix: bool = False) -> List[int]:
+        """검색어의 모든 단어를 포함하는 작업 번호 목록 (문서 순서)"""
+        terms = query.lower().split()
+        if not terms:
+            return []
+        with self._lock:
+            return self._search(terms, prefix)
+
+    def _search(self, terms: List[str], prefix: bool) -> List[int]:
+        match = self._match_prefix if prefix else self._match_substring
+        title_ids = match(terms[0])
+        for term in terms[1:]:
+            if not title_ids:
+                break
+            title_ids &= match(term)
+        offsets, indices = self._task_offsets, self._task_indices
+        result: List[int] = []
+        for title_id in title_ids:
+            result.extend(indices[offsets[title_id]:offsets[title_id + 1]])
+        result.sort()
+        return result
+
+# 파일 경로 -> 제목 역색인, 최근 사용 순 (TITLE_INDEX_CACHE_SIZE개까지)
+_title_indexes: "OrderedDict[str, TitleIndex]" = OrderedDict()
+
+async def get_title_index(model: PlanModel, file_path: str = PLAN_FILE) -> TitleIndex:
+    """계획 모델에 맞춰 갱신된 제목 역색인 반환
+
+    색인은 작업 수에 비례하는 메모리를 쓰므로 최근에 검색한 계획의 것만 두고, 계획 모델이
+    캐시에서 밀려나면 함께 버린다. 처음 만들거나 다시 동기화하는 일은 작업자 스레드에서
+    하여 큰 계획에서도 다른 프로젝트의 요청을 막지 않는다.
+    """
+    path = os.path.abspath(file_path)
+    index = _title_indexes.get(path)
+    if index is None:
+        index = _title_indexes[path] = TitleIndex()
+    _title_indexes.move_to_end(path)
+    while len(_title_indexes) > TITLE_INDEX_CACHE_SIZE:
+        _title_indexes.popitem(last=False)
+    if index.model is not model:
+        with trace_span("title_index_sync", tasks=len(model)):
+            await asyncio.to_thread(index.sync, model)
+    return index
+
+class PlanHistory:
+    """project_task.md 수정 이력
+
+    수정마다 바뀐 상태 바이트만 델타로 기록하고 (위치, 이전 값, 새 값), 계획을 새로
+    만들 때와 PLAN_HISTORY_CHECKPOINT_INTERVAL번째 수정마다 전체 내용을 zlib으로
+    압축한 체크포인트를 남긴다. 임의 리비전은 직전 체크포인트에 델타를 차례로 적용해
+    복원하므로 델타 사슬 길이에 비례하는 시간이 든다. 이력은 JSONL 파일 하나에
+    추가만 하고, 보관 개수를 넘으면 체크포인트 경계에서 앞부분을 잘라낸다.
+
+    에디터 등 외부에서 계획이 바뀐 경우 (헤드에 기록된 지문과 다른 경우) 다음 수정
+    전에 현재 내용을 체크포인트로 남겨 이력이 실제 파일과 어긋나지 않게 한다.
+    """
+
+    def __init__(self, plan_path: str):
+        self.plan_path = plan_path
+        base = os.path.join(os.path.dirname(plan_path), "." + os.path.basename(plan_path))
+        self.log_path = base + ".history.jsonl"
+        self.head_path = base + ".history.head"
+        self._size = -1
+        self._offsets: List[int] = []   # 기록별 로그 파일 내 시작 위치
+        self._revs: List[int] = []
+        self._kinds: List[str] = []
+
+    def _load(self) -> None:
+        """로그 파일이 바뀌었으면 기록 위치 색인을 다시 만든다"""
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+        if size == self._size:
+            return
+        self._offsets, self._revs, self._kinds = [], [], []
+        if size:
+            with open(self.log_path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if line.endswith(b"\n"):
+                        record = json.loads(line)
+                        self._offsets.append(offset)
+                        self._revs.append(record["rev"])
+                        self._kinds.append(record["kind"])
+                    offset += len(line)
+        self._size = size
+
+    def _read(self, position: int) -> Dict[str, Any]:
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._offsets[position])
+            return json.loads(f.readline())
+
+    def _head_fingerprint(self) -> Optional[List[int]]:
+        try:
+            return json.loads(load_from_file(self.head_path) or "null")["fingerprint"]
+        except (TypeError, KeyError, ValueError):
+            return None
+
+    def _write_head(self) -> None:
+        fingerprint = file_fingerprint(self.plan_path)
+        save_to_file(self.head_path, json.dumps({
+            "rev": self._revs[-1] if self._revs else 0,
+            "fingerprint": list(fingerprint) if fingerprint else None,
+        }))
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with trace_span("plan_history", kind=record["kind"]):
+            self._load()
+            record["rev"] = (self._revs[-1] + 1) if self._revs else 1
+            record["time"] = time.time()
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            with open(self.log_path, 'ab') as f:
+                f.write(line)
+            self._offsets.append(self._size)
+            self._revs.append(record["rev"])
+            self._kinds.append(record["kind"])
+            self._size += len(line)
+            if len(self._revs) > PLAN_HISTORY_LIMIT:
+                self._compact()
+            self._write_head()
+
+    def _compact(self) -> None:
+        """보관 개수를 넘는 오래된 기록 제거 - 남는 첫 기록은 항상 체크포인트"""
+        first = len(self._revs) - PLAN_HISTORY_LIMIT
+        while first < len(self._kinds) and self._kinds[first] != "checkpoint":
+            first += 1
+        if first >= len(self._kinds):
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._offsets[first])
+            data = f.read()
+        _write_atomic(Path(self.log_path), data)
+        self._size = -1
+        self._load()
+
+    def sync(self, fingerprint: Optional[Tuple[int, int, int]]) -> None:
+        """외부 수정이 있었으면 현재 계획 내용을 체크포인트로 기록"""
+        self._load()
+        if fingerprint is None:
+            return
+        if self._revs and self._head_fingerprint() == list(fingerprint):
+            return
+        with open(self.plan_path, 'rb') as f:
+            self.record_checkpoint(f.read(), "외부 수정")
+
+    def record_checkpoint(self, content: bytes, summary: str,
+                          transitions: Optional[List[Tuple[str, str, str]]] = None) -> None:
+        """전체 내용 체크포인트 기록"""
+        record = {
+            "kind": "checkpoint",
+            "summary": summary,
+            "content": base64.b64encode(zlib.compress(content)).decode("ascii"),
+        }
+        if transitions is not None:
+            record["transitions"] = transitions
+        self._append(record)
+
+    def record_delta(self, changes: List[Tuple[int, str, str]], summary: str,
+                     transitions: Optional[List[Tuple[str, str, str]]] = None) -> None:
+        """상태 바이트 델타 기록 - 체크포인트 간격마다 전체 내용으로 대신 기록
+
+        transitions는 (작업 ID, 이전 상태, 새 상태) 목록으로, 되돌릴 때 상태 전환 기록에 쓴다.
+        """
+        self._load()
+        since_checkpoint = 0
+        for kind in reversed(self._kinds):
+            if kind == "checkpoint":
+                break
+            since_checkpoint += 1
+        if since_checkpoint + 1 >= PLAN_HISTORY_CHECKPOINT_INTERVAL:
+            with open(self.plan_path, 'rb') as f:
+                self.record_checkpoint(f.read(), summary, transitions)
+            return
+        record = {"kind": "delta", "summary": summary, "changes": changes}
+        if transitions is not None:
+            record["transitions"] = transitions
+        self._append(record)
+
+    def revisions(self) -> List[Dict[str, Any]]:
+        """보관 중인 리비전 요약 목록 (오래된 순)"""
+        self._load()
+        result = []
+        for position in range(len(self._revs)):
+            record = self._read(position)
+            result.append({"rev": record["rev"], "kind": record["kind"],
+                           "time": record["time"], "summary": record["summary"]})
+        return result
+
+    def content_at(self, rev: int) -> Optional[bytes]:
+        """리비전 rev 시점의 계획 내용 - 직전 체크포인트에 델타를 적용해 복원"""
+        self._load()
+        if rev not in self._revs:
+            return None
+        target = self._revs.index(rev)
+        start = target
+        while self._kinds[start] != "checkpoint":
+            start -= 1
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._offsets[start])
+            checkpoint = json.loads(f.readline())
+            content = bytearray(zlib.decompress(base64.b64decode(checkpoint["content"])))
+            for _ in range(target - start):
+                for offset, _, new in json.loads(f.readline())["changes"]:
+                    content[offset] = ord(new)
+        return bytes(content)
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """마지막 수정을 되돌리고 해당 기록을 반환, 되돌릴 수정이 없으면 None"""
+        self.sync(file_fingerprint(self.plan_path))
+        if len(self._revs) < 2:
+            return None
+        record = self._read(len(self._revs) - 1)
+        if record["kind"] == "delta":
+            with open(self.plan_path, 'r+b') as f:
+                for offset, old, _ in record["changes"]:
+                    f.seek(offset)
+                    f.write(old.encode("ascii"))
+            invalidate_file(self.plan_path)
+        else:
+            previous = self.content_at(self._revs[-2])
+            save_to_file(self.plan_path, previous.decode("utf-8"))
+        with open(self.log_path, 'r+b') as f:
+            f.truncate(self._offsets[-1])
+        self._size = -1
+        self._load()
+        self._write_head()
+        return record
+
+# 계획 파일 경로 -> 수정 이력
+_plan_histories: Dict[str, PlanHistory] = {}
+
+def get_plan_history(file_path: str = PLAN_FILE) -> PlanHistory:
+    """계획 파일의 수정 이력 객체 반환"""
+    path = os.path.abspath(file_path)
+    history = _plan_histories.get(path)
+    if history is None:
+        history = _plan_histories[path] = PlanHistory(path)
+    return history
+
+class TimingStore:
+    """작업 상태 전환 기록 - 열(column)마다 파일 하나에 고정 폭 값을 추가만 한다
+
+    time(유닉스 시각, f64), task(작업 ID 코드, u32), epic(대분류 번호, u32), level(단계, u8),
+    state(상태 문자, u8), worker(기록자 코드, u16) 여섯 열과 코드 → 문자열 사전
+    (tasks.txt, workers.txt)으로 이루어지며 한 행은 20바이트이다. 열 파일을 그대로 배열로
+    읽으므로 (numpy가 있으면 np.fromfile) 수백만 건도 행마다 파이썬 객체를 만들지 않고
+    집계할 수 있다. 사전은 열보다 먼저 기록하고, 기록 중 중단되어 열 길이가 어긋나면
+    가장 짧은 열에 맞춰 읽는다.
+    """
+
+    COLUMNS = (("time", "d"), ("task", "I"), ("epic", "I"), ("level", "B"), ("state", "B"), ("worker", "H"))
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # 사전 파일 이름 -> (지문, 문자열 -> 코드, 코드 순서 문자열 목록)
+        self._dictionaries: Dict[str, Tuple[Optional[Tuple[int, int, int]], Dict[str, int], List[str]]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _dictionary(self, name: str) -> Tuple[Dict[str, int], List[str]]:
+        """사전 로드 - 파일이 바뀌었으면 (초기화, 스냅샷 복원 등) 다시 읽는다"""
+        path = self._path(name)
+        fingerprint = _stat_fingerprint(path)
+        cached = self._dictionaries.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1], cached[2]
+        values = []
+        if fingerprint is not None:
+            with open(path, 'r', encoding='utf-8') as f:
+                values = f.read().splitlines()
+        codes = {value: code for code, value in enumerate(values)}
+        self._dictionaries[name] = (fingerprint, codes, values)
+        return codes, values
+
+    def _encode(self, name: str, items: List[str]) -> List[int]:
+        """문자열 목록을 코드로 변환 - 새 문자열은 사전 파일에 추가"""
+        codes, values = self._dictionary(name)
+        added = []
+        result = []
+        for item in items:
+            code = codes.get(item)
+            if code is None:
+                code = codes[item] = len(values)
+                values.append(item)
+                added.append(item)
+            result.append(code)
+        if added:
+            path = self._path(name)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("".join(item + "\n" for item in added))
+            self._dictionaries[name] = (_stat_fingerprint(path), codes, values)
+        return result
+
+    def append(self, events: List[Tuple[str, str]], when: Optional[float] = None) -> None:
+        """(작업 ID, 새 상태) 전환을 같은 시각으로 기록"""
+        if not events:
+            return
+        when = time.time() if when is None else when
+        with trace_span("timing_append", events=len(events)):
+            os.makedirs(self.directory, exist_ok=True)
+            task_ids = [task_id for task_id, _ in events]
+            heads = [task_id.split(".", 1)[0] for task_id in task_ids]
+            values = {
+                "time": [when] * len(events),
+                "task": self._encode("tasks.txt", task_ids),
+                "epic": [int(head) if head.isdigit() else 0 for head in heads],
+                "level": [task_id.count(".") + 1 for task_id in task_ids],
+                "state": [ord(state) for _, state in events],
+                "worker": self._encode("workers.txt", [TIMING_WORKER])[0:1] * len(events),
+            }
+            for name, typecode in self.COLUMNS:
+                with open(self._path(f"{name}.col"), 'ab') as f:
+                    f.write(array(typecode, values[name]).tobytes())
+
+    def columns(self) -> Dict[str, Any]:
+        """열 전체를 배열로 로드 (numpy가 있으면 ndarray, 없으면 array)"""
+        columns: Dict[str, Any] = {}
+        for name, typecode in self.COLUMNS:
+            path = self._path(f"{name}.col")
+            if not os.path.exists(path):
+                columns[name] = np.empty(0, dtype=typecode) if np is not None else array(typecode)
+            elif np is not None:
+                columns[name] = np.fromfile(path, dtype=typecode)
+            else:
+                column = array(typecode)
+                with open(path, 'rb') as f:
+                    data = f.read()
+                column.frombytes(data[:len(data) - len(data) % column.itemsize])
+                columns[name] = column
+        rows = min(len(column) for column in columns.values())
+        return {name: column[:rows] for name, column in columns.items()}
+
+    def task_ids(self) -> List[str]:
+        """작업 ID 사전 (코드 순서)"""
+        return self._dictionary("tasks.txt")[1]
+
+    def workers(self) -> List[str]:
+        """기록자 사전 (코드 순서)"""
+        return self._dictionary("workers.txt")[1]
+
+    def reset(self) -> None:
+        """기록 전체 삭제 (새 계획 수립 시)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._dictionaries.clear()
+
+# 기록 디렉토리 경로 -> 상태 전환 기록
+_timing_stores: Dict[str, TimingStore] = {}
+
+def get_timing_store(directory: str = TIMING_DIR) -> TimingStore:
+    """작업 공간의 상태 전환 기록 객체 반환"""
+    path = os.path.abspath(directory)
+    store = _timing_stores.get(path)
+    if store is None:
+        store = _timing_stores[path] = TimingStore(path)
+    return store
+
+def update_task_statuses(model: PlanModel, changes: Dict[int, str], file_path: str = PLAN_FILE) -> None:
+    """작업 상태 변경 - 파일에서는 바뀐 상태 문자 바이트만 덮어쓰고 이력에 델타로, 상태 전환 기록에 시각과 함께 기록"""
+    path = os.path.abspath(file_path)
+    history = get_plan_history(path)
+    cached = _plan_models.get(path)
+    history.sync(cached[0] if cached is not None and cached[1] is model else file_fingerprint(path))
+    
+    delta = [(model.offsets[task_index], model.status(task_index), status)
+             for task_index, status in sorted(changes.items())]
+    with open(path, 'r+b') as f:
+        for offset, _, status in delta:
+            f.seek(offset)
+            f.write(status.encode("ascii"))
+    invalidate_file(path)
+    for task_index, status in changes.items():
+        model.set_status(task_index, status)
+    _cache_plan_model(path, file_fingerprint(path), model)
+    
+    transitions = [(model.task_id(task_index), old, status)
+                   for (task_index, status), (_, old, _) in zip(sorted(changes.items()), delta)]
+    summary = ", ".join(f"{task_id} {TASK_STATUSES[status]}" for task_id, _, status in transitions)
+    history.record_delta(delta, summary, transitions)
+    get_timing_store().append([(task_id, status) for task_id, _, status in transitions])
+
+class PlanShards:
+    """대분류별로 나누어 저장한 작업 계획
+
+    매니페스트(PLAN_MANIFEST)에는 계획 머리말, 대분류별 파일 이름·제목·상태·하위 작업
+    상태 수, 수정 순서(journal), 병합 보기 기록만 두고, 작업 줄은 대분류마다
+    PLAN_SHARD_DIR/epic-0001.md 같은 파일에 나누어 저장한다. 각 파일은 단일 파일 모드와
+    같은 PlanModel·바이트 패치·수정 이력을 그대로 쓰므로, 작업 시작·완료·재개는
+    매니페스트로 대분류를 고른 뒤 그 파일 하나만 읽고 쓴다.
+
+    PLAN_FILE은 대분류 파일을 이어 붙인 병합 보기다. 상태 변경은 병합 보기의 같은
+    위치에도 바이트 패치로 반영하여 항상 대분류 파일들과 같게 유지하고, 되돌리기처럼
+    패치할 수 없는 경우에는 병합 보기를 다시 만든다. 병합 보기를 직접 편집하면 다음
+    요청에서 그 내용으로 다시 분할한다 (임계값보다 작아졌으면 단일 파일 모드로 돌아간다).
+    """
+
+    def __init__(self, manifest: Dict[str, Any]):
+        self.manifest = manifest
+        self.epics: List[Dict[str, Any]] = manifest["epics"]
+
+    def path(self, entry: Dict[str, Any]) -> str:
+        """대분류 파일 경로"""
+        return os.path.join(PLAN_SHARD_DIR, entry["file"])
+
+    def entry_for(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """작업 ID가 속한 대분류 항목"""
+        epic_id = task_id.split(".", 1)[0]
+        return next((entry for entry in self.epics if entry["id"] == epic_id), None)
+
+    def select(self, status: str, last: bool = False) -> Tuple[Optional[PlanModel], str]:
+        """status 상태의 작업이 있는 첫 번째 (last=True면 마지막) 대분류의 모델과 파일 경로"""
+        for entry in (reversed(self.epics) if last else self.epics):
+            if entry["status"] == status or entry["counts"][status]:
+                path = self.path(entry)
+                return load_plan_model(path), path
+        return None, ""
+
+    def locate(self, task_id: str) -> Tuple[Optional[PlanModel], str]:
+        """작업 ID가 속한 대분류의 모델과 파일 경로"""
+        entry = self.entry_for(task_id)
+        if entry is None:
+            return None, ""
+        path = self.path(entry)
+        return load_plan_model(path), path
+
+    def totals(self) -> Dict[str, int]:
+        """전체 하위 작업 상태 수 (매니페스트만 사용)"""
+        totals = dict.fromkeys(TASK_STATUSES, 0)
+        for entry in self.epics:
+            for status, count in entry["counts"].items():
+                totals[status] += count
+        return totals
+
+    def update_statuses(self, model: PlanModel, changes: Dict[int, str], file_path: str) -> None:
+        """대분류 파일의 작업 상태 변경 후 병합 보기와 매니페스트 갱신"""
+        in_sync = self.merged_in_sync()
+        update_task_statuses(model, changes, file_path)
+        self.refresh(file_path, model)
+        if in_sync:
+            self.patch_merged(file_path, [(model.offsets[index], status) for index, status in changes.items()])
+        journal = self.manifest["journal"]
+        journal.append(os.path.basename(file_path))
+        del journal[:-PLAN_HISTORY_LIMIT]
+        self.save()
+
+    def merged_in_sync(self) -> bool:
+        """병합 보기가 현재 대분류 파일들과 같은 내용인지 (기록 기준)"""
+        merged = self.manifest["merged"]
+        fingerprint = file_fingerprint(PLAN_FILE)
+        return (merged["rev"] == self.manifest["rev"] and merged.get("offsets") is not None
+                and fingerprint is not None and list(fingerprint) == merged["fingerprint"])
+
+    def patch_merged(self, file_path: str, patches: List[Tuple[int, str]]) -> None:
+        """대분류 파일에 쓴 상태 문자를 병합 보기의 같은 위치에도 덮어쓴다
+
+        대분류 파일은 상태 문자만 바뀌어 길이가 그대로이므로, 병합 보기에서 각 대분류의
+        시작 위치(merged["offsets"])에 대분류 파일 안의 위치를 더하면 된다.
+        """
+        merged = self.manifest["merged"]
+        name = os.path.basename(file_path)
+        start = merged["offsets"][next(number for number, entry in enumerate(self.epics) if entry["file"] == name)]
+        path = os.path.abspath(PLAN_FILE)
+        with open(path, 'r+b') as f:
+            for offset, status in patches:
+                f.seek(start + offset)
+                f.write(status.encode("ascii"))
+        invalidate_file(path)
+        merged.update(rev=self.manifest["rev"], fingerprint=list(file_fingerprint(path)))
+
+    def refresh(self, file_path: str, model: PlanModel) -> None:
+        """대분류 파일 모델로 매니페스트 항목의 상태와 상태 수 갱신 (저장은 save)"""
+        name = os.path.basename(file_path)
+        entry = next(entry for entry in self.epics if entry["file"] == name)
+        entry["status"] = model.status(0) if len(model) else " "
+        entry["counts"] = dict(model.epic_counts.get(0, dict.fromkeys(TASK_STATUSES, 0)))
+        self.manifest["rev"] += 1
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """마지막으로 수정된 대분류 파일의 수정 되돌리기 - 기록의 rev에 대분류 번호를 붙여 반환"""
+        journal = self.manifest["journal"]
+        record = None
+        while journal and record is None:
+            name = journal.pop()
+            path = os.path.join(PLAN_SHARD_DIR, name)
+            record = get_plan_history(path).undo()
+            if record is not None:
+                self.refresh(path, load_plan_model(path))
+                epic_id = next(entry["id"] for entry in self.epics if entry["file"] == name)
+                record["rev"] = f"{epic_id}.r{record['rev']}"
+        self.save()
+        if record is not None and file_fingerprint(PLAN_FILE) is not None:
+            self.merge()
+        return record
+
+    def render(self) -> bytes:
+        """머리말과 대분류 파일들을 이어 붙인 계획 전체"""
+        parts = [self.manifest["header"].encode("utf-8")]
+        for entry in self.epics:
+            with open(self.path(entry), 'rb') as f:
+                parts.append(f.read())
+        return b"".join(parts)
+
+    def merge(self) -> None:
+        """병합 보기(PLAN_FILE)가 대분류 파일들보다 오래되었으면 다시 만든다"""
+        merged = self.manifest["merged"]
+        if merged["rev"] == self.manifest["rev"] and file_fingerprint(PLAN_FILE) is not None:
+            return
+        with trace_span("merge_plan", epics=len(self.epics)):
+            offsets = []
+            parts = [self.manifest["header"].encode("utf-8")]
+            size = len(parts[0])
+            for entry in self.epics:
+                with open(self.path(entry), 'rb') as f:
+                    parts.append(f.read())
+                offsets.append(size)
+                size += len(parts[-1])
+            _write_atomic(Path(PLAN_FILE), b"".join(parts))
+        invalidate_file(PLAN_FILE)
+        merged.update(rev=self.manifest["rev"], offsets=offsets, fingerprint=list(file_fingerprint(PLAN_FILE)))
+        self.save()
+
+    def save(self) -> None:
+        """매니페스트 저장"""
+        _write_atomic(Path(PLAN_MANIFEST), json.dumps(self.manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+        invalidate_file(PLAN_MANIFEST)
+        _plan_shards[os.path.abspath(PLAN_MANIFEST)] = (file_fingerprint(PLAN_MANIFEST), self)
+
+# 매니페스트 경로 -> (지문, 분할 계획)
+_plan_shards: Dict[str, Tuple[Optional[Tuple[int, int, int]], PlanShards]] = {}
+
+def split_plan(content: bytes) -> Optional[PlanShards]:
+    """계획 내용을 대분류별 파일로 분할 저장 - 대분류가 없으면 None
+
+    새 디렉토리에 모두 쓴 뒤 기존 분할 디렉토리와 교체하고 마지막에 매니페스트를 쓴다.
+    """
+    with trace_span("split_plan", size=len(content)):
+        model = PlanModel(content)
+        epic_indices = [index for index in range(len(model)) if model.parents[index] < 0]
+        if not epic_indices:
+            return None
+        starts = [content.rfind(b"\n", 0, model.offsets[index]) + 1 for index in epic_indices]
+        
+        staging = f"{PLAN_SHARD_DIR}.split-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        epics = []
+        for number, (index, start) in enumerate(zip(epic_indices, starts), 1):
+            end = starts[number] if number < len(starts) else len(content)
+            file_name = f"epic-{number:04d}.md"
+            with open(os.path.join(staging, file_name), 'wb') as f:
+                f.write(content[start:end])
+            epics.append({
+                "id": model.task_id(index),
+                "title": model.title(index),
+                "file": file_name,
+                "status": model.status(index),
+                "counts": dict(model.epic_counts[index]),
+            })
+        shutil.rmtree(PLAN_SHARD_DIR, ignore_errors=True)
+        os.rename(staging, PLAN_SHARD_DIR)
+    
+    _invalidate_snapshot(PLAN_SHARD_DIR)
+    fingerprint = file_fingerprint(PLAN_FILE)
+    shards = PlanShards({
+        "version": 1,
+        "rev": 0,
+        "header": content[:starts[0]].decode("utf-8"),
+        "epics": epics,
+        "journal": [],
+        "merged": {"rev": 0, "offsets": starts,
+                   "fingerprint": list(fingerprint) if fingerprint else None},
+    })
+    shards.save()
+    return shards
+
+def remove_plan_shards() -> None:
+    """분할 저장 해제 - 매니페스트와 대분류 파일(수정 이력 포함) 삭제"""
+    delete_file(PLAN_MANIFEST)
+    shutil.rmtree(PLAN_SHARD_DIR, ignore_errors=True)
+    _invalidate_snapshot(PLAN_SHARD_DIR)
+
+def get_plan_shards() -> Optional[PlanShards]:
+    """분할 저장 모드면 PlanShards, 단일 파일 모드면 None
+
+    단일 파일 모드에서 계획 파일이 PLAN_SHARD_THRESHOLD를 넘으면 이때 분할한다.
+    병합 보기의 지문이 기록과 다르면 대분류 파일들과 내용을 비교해 실제 편집 여부를 확인하여
+    (스냅샷 복원처럼 내용은 같고 지문만 바뀐 경우 제외) 편집된 내용으로 다시 분할한다.
+    병합 보기가 마지막 상태 변경보다 오래된 것이었다면 다시 분할하면 그 사이 진행 상황을
+    잃으므로, 편집을 반영하지 않고 병합 보기를 대분류 파일들로 다시 만든다.
+    """
+    _workspace_watcher.poll()
+    plan_fingerprint = file_fingerprint(PLAN_FILE)
+    manifest_fingerprint = file_fingerprint(PLAN_MANIFEST)
+    if manifest_fingerprint is None:
+        if (plan_fingerprint is None or PLAN_SHARD_THRESHOLD <= 0
+                or plan_fingerprint[1] < PLAN_SHARD_THRESHOLD):
+            return None
+        with open(PLAN_FILE, 'rb') as f:
+            return split_plan(f.read())
+    
+    path = os.path.abspath(PLAN_MANIFEST)
+    cached = _plan_shards.get(path)
+    if cached is not None and cached[0] == manifest_fingerprint:
+        shards = cached[1]
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            shards = PlanShards(json.load(f))
+        _plan_shards[path] = (manifest_fingerprint, shards)
+    
+    merged = shards.manifest["merged"]
+    if plan_fingerprint is not None and list(plan_fingerprint) != merged["fingerprint"]:
+        with open(PLAN_FILE, 'rb') as f:
+            content = f.read()
+        if content != shards.render():
+            if merged["rev"] != shards.manifest["rev"] or merged.get("offsets") is None:
+                print(f"⚠️ {PLAN_FILE}이(가) 최신 작업 상태보다 오래된 병합 보기에서 편집되어 "
+                      "반영하지 않고 다시 만듭니다.", file=sys.stderr)
+                merged["rev"] = -1
+                shards.merge()
+                return shards
+            if PLAN_SHARD_THRESHOLD <= 0 or len(content) < PLAN_SHARD_THRESHOLD:
+                remove_plan_shards()
+                return None
+            return split_plan(content)
+        merged["fingerprint"] = list(plan_fingerprint)
+        shards.save()
+    return shards
+
+@workspace_tool("task-new")
+async def task_new(ctx: Optional[Context] = None) -> str:
     """새 프로젝트 요구사항 생성 - 7가지 핵심 질문을 통한 체계적 요구사항 수집
     
+    Args:
+        ctx: MCP 요청 컨텍스트 (문서 생성 진행 알림과 취소 확인에 사용)
+        
     Returns:
         str: 첫 번째 질문 또는 완료 메시지
     """
@@ -114,8 +2013,7 @@ async def task_new() -> str:
         current_q = state["questions"][state["current_question"]]
         
         # 상태 저장
-        with open(state_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, ensure_ascii=False, indent=2)
+        save_to_file(state_file, json.dumps(state, ensure_ascii=False, indent=2))
         
         return f"""📱 새 프로젝트 요구사항 생성 ({state["current_question"] + 1}/7)
 
@@ -126,10 +2024,15 @@ async def task_new() -> str:
 답변을 입력해주세요. 답변 후 다시 /task-new를 실행하여 다음 질문으로 넘어갑니다."""
     
     # 모든 질문 완료 - 문서 생성
-    return await _generate_requirements_docs(state["answers"])
+    return await _generate_requirements_docs(state["answers"], ctx)
+
+@traced
+async def _generate_requirements_docs(answers: Dict[str, str], ctx: Optional[Context] = None) -> str:
+    """요구사항 문서들 생성
 
-async def _generate_requirements_docs(answers: Dict[str, str]) -> str:
-    """요구사항 문서들 생성"""
+    렌더링이 끝난 뒤 취소 확인 지점을 한 번 두고, 저장 단계는 중단 없이 실행한다.
+    """
+    await report_phase(ctx, 0, 2, "요구사항 문서 생성 중")
     
     # requirements.md 생성
     requirements_content = f"""# 📱 프로젝트 요구사항 요약
@@ -512,26 +2415,26 @@ async def _generate_requirements_docs(answers: Dict[str, str]) -> str:
 
 ### 응답 표준 형식
 ```json
-{
+{{
   "success": true,
   "data": {{}},
   "message": "성공적으로 처리되었습니다",
   "timestamp": "2024-01-01T00:00:00Z",
   "version": "v1"
-}
+}}
 ```
 
 ### 에러 응답 형식
 ```json
-{
+{{
   "success": false,
-  "error": {
+  "error": {{
     "code": "VALIDATION_ERROR",
     "message": "입력값이 올바르지 않습니다",
     "details": ["이메일 형식이 잘못되었습니다"]
-  },
+  }},
   "timestamp": "2024-01-01T00:00:00Z"
-}
+}}
 ```
 
 ## 4. 데이터베이스 설계
@@ -753,40 +2656,57 @@ Test     Test      Test     Test
 
 이 기술 사양서는 **task-start** 단계에서 개발 작업 시작 시 핵심 참조 문서로 활용됩니다."""
     
+    # 여기까지 취소되면 디스크는 그대로 - 이후 저장은 await 없이 끝까지 진행
+    await report_phase(ctx, 1, 2, "요구사항 문서 저장 중")
+    
     # 파일들 저장
-    save_to_file("docs/requirements.md", requirements_content)
-    save_to_file("docs/designed.md", designed_content)
-    save_to_file("docs/technical_spec.md", technical_spec_content)
+    # 내용이 바뀐 문서만 저장
+    documents = [
+        ("docs/requirements.md", requirements_content, "프로젝트 요구사항 요약"),
+        ("docs/designed.md", designed_content, "디자인 가이드"),
+        ("docs/technical_spec.md", technical_spec_content, "기술 사양서"),
+    ]
+    hashes = load_doc_hashes()
+    recorded = dict(hashes)
+    changed = {path for path, content, _ in documents if save_if_changed(path, content, hashes)}
+    if hashes != recorded:
+        save_to_file(DOC_HASHES_FILE, json.dumps(hashes, ensure_ascii=False, indent=2))
     
     # 상태 파일 삭제
-    if Path("docs/.task_new_state.json").exists():
-        Path("docs/.task_new_state.json").unlink()
+    delete_file("docs/.task_new_state.json")
     
-    return """✅ 요구사항 문서가 성공적으로 생성되었습니다!
+    if ctx is not None:
+        await ctx.report_progress(2, 2, "요구사항 문서 생성 완료")
+    
+    file_lines = "\n".join(
+        f"- {path}: {description}" + ("" if path in changed else " (변경 없음)")
+        for path, _, description in documents
+    )
+    return f"""✅ 요구사항 문서가 성공적으로 생성되었습니다!
 
 📁 생성된 파일들:
-- docs/requirements.md: 프로젝트 요구사항 요약
-- docs/designed.md: 디자인 가이드
-- docs/technical_spec.md: 기술 사양서
+{file_lines}
 
 🚀 다음 단계: /task-plan 명령어를 실행하여 프로젝트 계획을 수립하세요."""
 
-@mcp.tool(name="task-new-answer")
-async def task_new_answer(answer: str) -> str:
+@workspace_tool("task-new-answer")
+async def task_new_answer(answer: str, ctx: Optional[Context] = None) -> str:
     """새 프로젝트 요구사항 수집 - 사용자 답변 처리
     
     명령어: task-new-answer
     
     Args:
         answer: 사용자의 답변
+        ctx: MCP 요청 컨텍스트 (문서 생성 진행 알림과 취소 확인에 사용)
         
     Returns:
         str: 다음 질문 또는 완료 메시지
     """
     state_file = "docs/.task_new_state.json"
     
-    if not check_file_exists(state_file):
-        return "❌ 먼저 /task-new 명령으로 질문을 시작해주세요."
+    missing = missing_prerequisites({state_file: "먼저 /task-new 명령으로 질문을 시작해주세요."})
+    if missing:
+        return missing[0]
     
     with open(state_file, 'r', encoding='utf-8') as f:
         state = json.load(f)
@@ -802,8 +2722,7 @@ async def task_new_answer(answer: str) -> str:
             current_q = state["questions"][state["current_question"]]
             
             # 상태 저장
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, ensure_ascii=False, indent=2)
+            save_to_file(state_file, json.dumps(state, ensure_ascii=False, indent=2))
             
             return f"""📱 새 프로젝트 요구사항 생성 ({state["current_question"] + 1}/7)
 
@@ -814,52 +2733,73 @@ async def task_new_answer(answer: str) -> str:
 답변을 입력해주세요."""
         
         # 모든 질문 완료
-        result = await _generate_requirements_docs(state["answers"])
-        
-        # 상태 파일 삭제
-        if Path(state_file).exists():
-            Path(state_file).unlink()
-        
-        return result
+        return await _generate_requirements_docs(state["answers"], ctx)
     
     return "❌ 이미 모든 질문에 답변하셨습니다."
 
-@mcp.tool(name="task-plan")
-async def task_plan() -> str:
+@workspace_tool("task-plan")
+async def task_plan(ctx: Optional[Context] = None) -> str:
     """프로젝트 계획 수립 - 요구사항 문서들을 분석하여 작업 계획 생성
     
     명령어: task-plan
     
+    Args:
+        ctx: MCP 요청 컨텍스트 (단계별 진행 알림과 취소 확인에 사용)
+        
     Returns:
         str: 계획 수립 결과 메시지
     """
+    await report_phase(ctx, 0, 4, "요구사항 문서 확인 중")
     ensure_docs_dir()
     
     # 필수 파일들 확인
-    missing_files = []
-    for file_path, error_msg in REQUIRED_FILES.items():
-        if not check_file_exists(file_path):
-            missing_files.append(f"❌ {error_msg}")
+    missing_files = missing_prerequisites(REQUIRED_FILES)
     
     if missing_files:
         return "\n".join(missing_files)
     
-    # 요구사항 문서들 로드
-    requirements = load_from_file("docs/requirements.md")
-    designed = load_from_file("docs/designed.md") 
-    technical_spec = load_from_file("docs/technical_spec.md")
+    await report_phase(ctx, 1, 4, "요구사항 문서 로드 중")
+    
+    # 동일한 요구사항 문서에서 생성된 계획이 있으면 재사용
+    spec_files = ("docs/requirements.md", "docs/designed.md", "docs/technical_spec.md")
+    fingerprints = _response_cache.fingerprint(spec_files)
+    project_plan = _response_cache.get("task-plan", (), fingerprints)
+    
+    await report_phase(ctx, 2, 4, "작업 계획 생성 중")
+    if project_plan is None:
+        # 요구사항 문서들은 지연 핸들로 넘겨 계획 수립에 필요한 부분만 읽는다
+        with SpecDocument("docs/requirements.md") as requirements, \
+                SpecDocument("docs/designed.md") as designed, \
+                SpecDocument("docs/technical_spec.md") as technical_spec:
+            # 5단계 사고 프로세스 적용하여 프로젝트 계획 수립
+            project_plan = await _generate_project_plan(requirements, designed, technical_spec)
+        _response_cache.put("task-plan", (), fingerprints, project_plan)
     
-    # 5단계 사고 프로세스 적용하여 프로젝트 계획 수립
-    project_plan = await _generate_project_plan(requirements, designed, technical_spec)
+    # 여기까지 취소되면 이전 계획이 그대로 남는다 - 이후 쓰기 단계는 await 없이 끝까지 진행
+    await report_phase(ctx, 3, 4, "작업 계획 저장 중")
     
     # project_task.md 파일 생성
-    save_to_file("docs/project_task.md", project_plan)
+    save_to_file(PLAN_FILE, project_plan)
+    get_plan_history().record_checkpoint(project_plan.encode("utf-8"), "계획 수립")
+    
+    # 이전 계획의 분할 저장과 상태 전환 기록은 버리고, 새 계획이 임계값을 넘으면 다시 분할
+    remove_plan_shards()
+    get_plan_shards()
+    get_timing_store().reset()
+    
+    if ctx is not None:
+        await ctx.report_progress(4, 4, "작업 계획 수립 완료")
     
     return """✅ 작업 계획이 생성되었습니다!
 🚀 /task-start로 첫 번째 작업을 시작하세요."""
 
-async def _generate_project_plan(requirements: str, designed: str, technical_spec: str) -> str:
-    """5단계 사고 프로세스를 적용한 프로젝트 계획 생성"""
+@traced
+async def _generate_project_plan(requirements: SpecDocument, designed: SpecDocument,
+                                 technical_spec: SpecDocument) -> str:
+    """5단계 사고 프로세스를 적용한 프로젝트 계획 생성
+
+    문서는 SpecDocument 지연 핸들이므로 text나 section()으로 접근한 부분만 읽힌다.
+    """
     
     # 요구사항에서 프로젝트명 추출 (간단히 "새 프로젝트"로 설정)
     project_name = "새 프로젝트"
@@ -938,7 +2878,61 @@ async def _generate_project_plan(requirements: str, designed: str, technical_spe
 """
     return plan_content
 
-@mcp.tool(name="task-start") 
+def _plan_workspace(root: str) -> Dict[str, Any]:
+    """작업 공간 하나에서 task-plan 실행 (프로세스 풀 작업자에서 호출)"""
+    try:
+        os.chdir(root)
+        message = asyncio.run(task_plan())
+    except Exception as e:
+        return {"workspace": root, "ok": False, "message": f"❌ {type(e).__name__}: {e}"}
+    return {"workspace": root, "ok": not message.startswith("❌"), "message": message}
+
+def plan_workspaces(roots: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """여러 작업 공간의 계획을 프로세스 풀로 병렬 수립
+
+    작업 공간마다 기존 task-plan 로직(필수 파일 확인, 문서 로드, 계획 생성)을 그대로
+    실행하며, 한 작업 공간의 실패는 결과에만 기록하고 나머지는 계속 진행한다.
+    결과는 입력 순서대로 반환한다.
+    """
+    roots = [os.path.abspath(root) for root in roots]
+    if not roots:
+        return []
+    workers = min(max_workers or os.cpu_count() or 1, len(roots))
+    # 서버 프로세스의 스레드 상태를 물려받지 않도록 spawn 방식 사용
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_plan_workspace, roots))
+
+def _format_batch_results(results: List[Dict[str, Any]]) -> str:
+    """일괄 계획 결과 요약"""
+    succeeded = sum(1 for result in results if result["ok"])
+    lines = [f"📦 일괄 계획 수립 결과: {succeeded}/{len(results)} 성공", ""]
+    for result in results:
+        icon = "✅" if result["ok"] else "❌"
+        summary = result["message"].splitlines()[0].lstrip("✅❌ ") if result["message"] else ""
+        lines.append(f"{icon} {result['workspace']}: {summary}")
+    return "\n".join(lines)
+
+@workspace_tool("task-plan-batch")
+async def task_plan_batch(workspaces: List[str], max_workers: Optional[int] = None) -> str:
+    """여러 작업 공간의 프로젝트 계획을 병렬로 수립
+    
+    명령어: task-plan-batch
+    
+    Args:
+        workspaces: 작업 공간 루트 경로 목록
+        max_workers: 최대 작업자 프로세스 수 (기본값: CPU 코어 수)
+        
+    Returns:
+        str: 작업 공간별 계획 수립 결과
+    """
+    if not workspaces:
+        return "❌ 작업 공간 목록이 비어 있습니다."
+    
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(None, plan_workspaces, workspaces, max_workers)
+    return _format_batch_results(results)
+
+@workspace_tool("task-start")
 async def task_start() -> str:
     """다음 작업 시작 및 완료 관리
     
@@ -947,46 +2941,30 @@ async def task_start() -> str:
     Returns:
         str: 작업 시작 결과 메시지
     """
-    # 필수 파일 확인
-    if not check_file_exists("docs/project_task.md"):
-        return "❌ 작업 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
-    
-    # project_task.md 로드
-    task_content = load_from_file("docs/project_task.md")
+    # 필수 파일 확인 및 project_task.md 로드 (분할 저장 모드면 대기중 작업이 있는 대분류 파일만)
+    shards = get_plan_shards()
+    if shards is None:
+        model, plan_path = load_plan_model(), PLAN_FILE
+        if model is None:
+            return "❌ 작업 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+    else:
+        model, plan_path = shards.select(" ")
     
     # 다음 작업 찾기 ([ ] 상태의 첫 번째 작업)
-    lines = task_content.split('\n')
-    next_task = None
-    next_task_line = -1
-    
-    for i, line in enumerate(lines):
-        if line.strip().startswith('- [ ]') and '.' in line:
-            # 중분류 작업 찾기
-            next_task = line.strip()
-            next_task_line = i
-            break
-        elif line.strip().startswith('[ ]') and '.' in line:
-            # 대분류 작업 찾기
-            next_task = line.strip()
-            next_task_line = i
-            break
-    
-    if not next_task:
+    next_task = model.next_pending() if model is not None else None
+    
+    if next_task is None:
         return "🎉 모든 작업이 완료되었습니다!"
     
     # 작업 ID와 이름 추출
-    task_parts = next_task.split(' ', 2)
-    if len(task_parts) >= 3:
-        task_id = task_parts[1]
-        task_name = task_parts[2]
-    else:
-        task_id = "작업"
-        task_name = next_task
+    task_id = f"{model.task_id(next_task)}."
+    task_name = model.title(next_task)
     
     # 작업 상태를 진행중([-])으로 변경
-    lines[next_task_line] = next_task.replace('[ ]', '[-]')
-    updated_content = '\n'.join(lines)
-    save_to_file("docs/project_task.md", updated_content)
+    if shards is None:
+        update_task_statuses(model, {next_task: "-"})
+    else:
+        shards.update_statuses(model, {next_task: "-"}, plan_path)
     
     # 디자인 파일 생성 확인 (UI, UX, 화면, 디자인 키워드 포함 시)
     design_keywords = ['UI', 'UX', '화면', '디자인', '인터페이스']
@@ -1010,6 +2988,7 @@ async def task_start() -> str:
 
 작업을 완료하면 /task-complete를 실행하세요."""
 
+@traced
 async def _update_design_file(task_name: str) -> None:
     """디자인 관련 작업 시 design.md 파일 업데이트"""
     design_content = f"""# 프로젝트 디자인 문서
@@ -1049,13 +3028,13 @@ async def _update_design_file(task_name: str) -> None:
 - **화면 흐름**: 사용자 경험 최적화된 플로우
 - **와이어프레임**: 텍스트 기반 레이아웃 설명
 
-작업 일시: {asyncio.get_event_loop().time()}
+작업 일시: {time.strftime("%Y-%m-%d %H:%M:%S")}
 """
     save_to_file("docs/design.md", design_content)
 
 
 
-@mcp.tool(name="task-resume")
+@workspace_tool("task-resume", coalesce=True)
 async def task_resume() -> str:
     """작업 재개 - 기존 프로젝트 이어서 진행
     
@@ -1064,51 +3043,558 @@ async def task_resume() -> str:
     Returns:
         str: 작업 재개 결과 메시지
     """
-    if not check_file_exists("docs/project_task.md"):
+    # 분할 저장 모드면 매니페스트가 바뀌기 전까지 같은 응답을 재사용
+    shards = get_plan_shards()
+    fingerprints = _response_cache.fingerprint((PLAN_FILE if shards is None else PLAN_MANIFEST,))
+    if fingerprints[0][1] is None:
         return "❌ 프로젝트 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
     
-    # 현재 상황 분석
-    task_content = load_from_file("docs/project_task.md")
-    lines = task_content.split('\n')
+    # 진행중인 작업 응답은 계획 파일이 바뀌기 전까지 재사용
+    cached = _response_cache.get("task-resume", (), fingerprints)
+    if cached is not None:
+        return cached
     
-    # 진행중인 작업이 있는지 확인
-    current_task = None
-    for line in lines:
-        if '[-]' in line:
-            task_parts = line.strip().split(' ', 2)
-            if len(task_parts) >= 3:
-                current_task = f"{task_parts[1]} {task_parts[2]}"
-            break
+    # 현재 상황 분석 - 진행중인 작업이 있는지 확인
+    model = load_plan_model() if shards is None else shards.select("-")[0]
+    current = model.current() if model is not None else None
+    current_task = model.label(current) if current is not None else None
     
     if current_task:
-        return f"""📋 이전 작업을 이어서 진행합니다.
+        result = f"""📋 이전 작업을 이어서 진행합니다.
 
 🚀 현재 진행중: {current_task}
 
 작업을 완료하면 /task-start를 실행하여 다음 작업을 시작하세요."""
+        _response_cache.put("task-resume", (), fingerprints, result)
+        return result
     
     # 진행중인 작업이 없으면 다음 작업 시작
     return await task_start()
 
 
 
-@mcp.tool(name="task-clean")
-async def task_clean() -> str:
+@workspace_tool("task-complete")
+async def task_complete(task_id: Optional[str] = None) -> str:
+    """작업 완료 처리 - 현재 작업(또는 지정한 작업)을 완료하고 상위 작업에 반영
+    
+    명령어: task-complete
+    
+    Args:
+        task_id: 완료할 작업 ID (예: "1.1.2"), 생략 시 가장 최근에 시작한 진행중 작업
+        
+    Returns:
+        str: 작업 완료 결과 메시지
+    """
+    shards = get_plan_shards()
+    if shards is None:
+        model, plan_path = load_plan_model(), PLAN_FILE
+        if model is None:
+            return "❌ 작업 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+    elif task_id:
+        model, plan_path = shards.locate(task_id.strip().rstrip("."))
+    else:
+        model, plan_path = shards.select("-", last=True)
+    
+    if task_id:
+        target = model.find(task_id.strip().rstrip(".")) if model is not None else None
+        if target is None:
+            return f"❌ {task_id} 작업을 찾을 수 없습니다."
+    else:
+        target = model.current_leaf() if model is not None else None
+        if target is None:
+            return "❌ 진행중인 작업이 없습니다. /task-start로 작업을 시작하세요."
+    
+    if model.status(target) == "x":
+        return f"✅ {model.label(target)} 작업은 이미 완료되었습니다."
+    
+    remaining = model.child_counts[target] - model.done_children[target]
+    if remaining:
+        return f"❌ {model.label(target)} 작업의 하위 작업 {remaining}개가 아직 완료되지 않았습니다."
+    
+    # 완료 처리 및 상위 작업 완료 전파
+    changes = model.completion_changes(target)
+    if shards is None:
+        update_task_statuses(model, changes)
+        totals = model.totals
+    else:
+        shards.update_statuses(model, changes, plan_path)
+        totals = shards.totals()
+    
+    rolled_up = [model.label(index) for index in sorted(changes, reverse=True) if index != target]
+    rollup_msg = "".join(f"\n🏁 상위 작업 완료: {label}" for label in rolled_up)
+    
+    return f"""✅ {model.label(target)} 완료{rollup_msg}
+
+📊 전체 진행률: {_format_counts(totals)}
+
+🚀 /task-start로 다음 작업을 시작하세요."""
+
+@workspace_tool("task-find", coalesce=True)
+async def task_find(query: str, status: Optional[str] = None, level: Optional[int] = None,
+                    prefix: bool = False, offset: int = 0, limit: int = 20) -> str:
+    """작업 검색 - 작업 제목에서 키워드로 작업 찾기
+    
+    명령어: task-find
+    
+    Args:
+        query: 검색어 (공백으로 구분된 모든 단어를 포함하는 작업 검색)
+        status: 상태 필터 (pending/in_progress/done 또는 대기중/진행중/완료)
+        level: 단계 필터 (1: 대분류, 2: 중분류, 3: 소분류)
+        prefix: True면 단어 접두사 일치, False면 부분 문자열(n-gram) 일치
+        offset: 건너뛸 결과 수
+        limit: 한 페이지 결과 수
+        
+    Returns:
+        str: 검색 결과 목록
+    """
+    # 분할 저장 모드면 병합 보기를 최신으로 만든 뒤 전체 계획을 사용
+    shards = get_plan_shards()
+    if shards is not None:
+        shards.merge()
+    model = load_plan_model()
+    if model is None:
+        return "❌ 프로젝트 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+    
+    status_filter = None
+    if status:
+        status_filter = STATUS_ALIASES.get(status.strip().lower())
+        if status_filter is None:
+            return f"❌ 알 수 없는 상태입니다: {status} (pending/in_progress/done)"
+    
+    matches = (await get_title_index(model)).search(query, prefix=prefix)
+    if status_filter is not None:
+        status_byte = ord(status_filter)
+        matches = [index for index in matches if model.statuses[index] == status_byte]
+    if level is not None:
+        matches = [index for index in matches if model.levels[index] == level]
+    
+    if not matches:
+        return f"🔍 '{query}' 검색 결과가 없습니다."
+    
+    offset = max(offset, 0)
+    limit = max(limit, 1)
+    page = matches[offset:offset + limit]
+    lines = [f"🔍 '{query}' 검색 결과: 총 {len(matches)}건 중 {offset + 1}-{offset + len(page)}", ""]
+    lines.extend(f"- [{model.status(index)}] {model.label(index)}" for index in page)
+    if offset + limit < len(matches):
+        lines.extend(["", f"➡️ 다음 페이지: offset={offset + limit}"])
+    return "\n".join(lines)
+
+def _encode_cursor(task_id: str) -> str:
+    """다음 페이지 시작 작업 ID를 커서 토큰으로 변환"""
+    return base64.urlsafe_b64encode(task_id.encode("ascii")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Optional[str]:
+    """커서 토큰에서 작업 ID 복원, 잘못된 토큰이면 None"""
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+@workspace_tool("task-list", coalesce=True)
+async def task_list(cursor: Optional[str] = None, status: Optional[str] = None,
+                    level: Optional[int] = None, page_size: int = LIST_PAGE_SIZE,
+                    ctx: Optional[Context] = None) -> str:
+    """작업 목록 조회 - 계획을 페이지 단위로 나누어 조회
+    
+    명령어: task-list
+    
+    Args:
+        cursor: 이전 페이지 결과의 다음 페이지 커서 (생략 시 처음부터)
+        status: 상태 필터 (pending/in_progress/done 또는 대기중/진행중/완료)
+        level: 단계 필터 (1: 대분류, 2: 중분류, 3: 소분류)
+        page_size: 한 페이지 작업 수 (최대 500)
+        
+    Returns:
+        str: 작업 목록 한 페이지와 다음 페이지 커서
+    """
+    # 분할 저장 모드면 병합 보기를 최신으로 만든 뒤 전체 계획을 사용
+    shards = get_plan_shards()
+    if shards is not None:
+        shards.merge()
+    model = load_plan_model()
+    if model is None:
+        return "❌ 프로젝트 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+    
+    status_filter = None
+    if status:
+        status_filter = STATUS_ALIASES.get(status.strip().lower())
+        if status_filter is None:
+            return f"❌ 알 수 없는 상태입니다: {status} (pending/in_progress/done)"
+    
+    start = 0
+    if cursor:
+        task_id = _decode_cursor(cursor)
+        start = model.find(task_id) if task_id else None
+        if start is None:
+            return "❌ 커서가 올바르지 않거나 계획이 변경되었습니다. 처음부터 다시 조회하세요."
+    
+    page_size = min(max(page_size, 1), LIST_MAX_PAGE_SIZE)
+    total = len(model)
+    statuses, levels = model.statuses, model.levels
+    status_byte = ord(status_filter) if status_filter is not None else None
+    
+    # 필터에 맞는 작업을 페이지 크기만큼만 렌더링
+    lines: List[str] = []
+    task_index = start
+    while task_index < total and len(lines) < page_size:
+        if ((status_byte is None or statuses[task_index] == status_byte)
+                and (level is None or levels[task_index] == level)):
+            lines.append(model.render(task_index))
+        task_index += 1
+        if ctx is not None and (task_index - start) % LIST_PROGRESS_INTERVAL == 0:
+            await ctx.report_progress(task_index, total, "작업 목록 조회 중")
+    
+    if ctx is not None:
+        await ctx.report_progress(task_index, total, "작업 목록 조회 완료")
+    
+    # 다음 페이지에 실제로 남은 작업이 있는지는 다음 호출에서 확인
+    header = f"📋 작업 목록 ({start + 1}-{task_index}번째 작업 / 전체 {total}개)"
+    if not lines:
+        lines.append("(조건에 맞는 작업이 없습니다)")
+    result = [header, ""] + lines
+    if task_index < total:
+        result.extend(["", f"➡️ 다음 페이지 커서: {_encode_cursor(model.task_id(task_index))}"])
+    return "\n".join(result)
+
+@workspace_tool("task-undo")
+async def task_undo() -> str:
+    """마지막 계획 수정 되돌리기
+    
+    명령어: task-undo
+    
+    Returns:
+        str: 되돌리기 결과 메시지
+    """
+    shards = get_plan_shards()
+    if shards is None and not check_file_exists(PLAN_FILE):
+        return "❌ 프로젝트 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+    
+    record = get_plan_history().undo() if shards is None else shards.undo()
+    if record is None:
+        return "❌ 되돌릴 수정 이력이 없습니다."
+    # 되돌린 상태도 전환으로 기록해야 작업 속도 집계가 계획과 어긋나지 않는다
+    get_timing_store().append([(task_id, old) for task_id, old, _ in record.get("transitions", ())])
+    return f"↩️ 리비전 {record['rev']} ({record['summary']}) 수정을 되돌렸습니다."
+
+@workspace_tool("task-history", coalesce=True)
+async def task_history(revision: Optional[int] = None, limit: int = 20, epic: Optional[str] = None) -> str:
+    """계획 수정 이력 조회 - 리비전을 지정하면 그 시점의 계획 내용 반환
+    
+    명령어: task-history
+    
+    Args:
+        revision: 조회할 리비전 번호 (생략 시 최근 수정 목록)
+        limit: 목록으로 보여줄 최근 리비전 수
+        epic: 분할 저장 모드에서 이력을 볼 대분류 번호 (예: "2"), 생략 시 전체 대분류의 최근 수정 목록
+        
+    Returns:
+        str: 수정 목록 또는 해당 리비전의 계획 내용
+    """
+    shards = get_plan_shards()
+    if shards is None:
+        histories = [("", get_plan_history())]
+    elif epic is not None:
+        entry = shards.entry_for(epic.strip().rstrip("."))
+        if entry is None:
+            return f"❌ {epic} 대분류를 찾을 수 없습니다."
+        histories = [(f"{entry['id']}.", get_plan_history(shards.path(entry)))]
+    elif revision is not None:
+        return "❌ 대분류별로 나누어 저장된 계획입니다. epic(대분류 번호)을 함께 지정하세요."
+    else:
+        histories = [(f"{entry['id']}.", get_plan_history(shards.path(entry))) for entry in shards.epics]
+    
+    if revision is not None:
+        content = histories[0][1].content_at(revision)
+        if content is None:
+            return f"❌ 리비전 {revision}은(는) 보관 중인 이력에 없습니다."
+        return f"🕘 리비전 {revision} 시점의 계획\n\n{content.decode('utf-8')}"
+    
+    revisions = sorted(
+        ((prefix, record) for prefix, history in histories for record in history.revisions()),
+        key=lambda item: item[1]["time"],
+    )[-max(limit, 1):]
+    if not revisions:
+        return "❌ 수정 이력이 없습니다."
+    lines = ["🕘 계획 수정 이력", ""]
+    for prefix, record in reversed(revisions):
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record["time"]))
+        kind = "전체" if record["kind"] == "checkpoint" else "델타"
+        lines.append(f"- {prefix}r{record['rev']} [{when}] ({kind}) {record['summary']}")
+    return "\n".join(lines)
+
+@workspace_tool("task-status", coalesce=True)
+async def task_status() -> str:
+    """프로젝트 진행 상황 확인 - 대분류별/전체 작업 상태 집계
+    
+    명령어: task-status
+    
+    Returns:
+        str: 진행 상황 요약
+    """
+    shards = get_plan_shards()
+    if shards is not None:
+        # 분할 저장 모드는 매니페스트의 대분류별 집계만 사용
+        lines = ["📊 프로젝트 진행 상황", "", f"**전체**: {_format_counts(shards.totals())}", ""]
+        for entry in shards.epics:
+            lines.append(f"- [{entry['status']}] {entry['id']}. {entry['title']}: {_format_counts(entry['counts'])}")
+    else:
+        model = load_plan_model()
+        if model is None:
+            return "❌ 프로젝트 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+        
+        lines = ["📊 프로젝트 진행 상황", "", f"**전체**: {_format_counts(model.totals)}", ""]
+        for epic, counts in model.epic_counts.items():
+            lines.append(f"- [{model.status(epic)}] {model.label(epic)}: {_format_counts(counts)}")
+    return "\n".join(lines + [""] + _format_server_stats())
+
+def _format_server_stats() -> List[str]:
+    """서버 프로세스 지표 (응답 캐시 적중률, 요청 수락 제어)"""
+    cache = _response_cache.stats()
+    lookups = cache["hits"] + cache["misses"]
+    admission = _admission.stats()
+    lane = admission["projects"].get(os.getcwd(), {"active": 0, "queued": 0})
+    return [
+        f"⚙️ 응답 캐시: 적중률 {cache['hit_rate']:.1%} (조회 {lookups}회 중 {cache['hits']}회 적중, 항목 {cache['size']}개)",
+        f"⚙️ 요청 수락: 수락 {admission['admitted']}회 · 병합 {admission['coalesced']}회 · 거절 {admission['rejected']}회 · "
+        f"실행 중 {lane['active']}개 · 대기 {lane['queued']}개",
+    ]
+
+def _velocity_numpy(columns: Dict[str, Any], task_count: int, since: float) -> Dict[str, Any]:
+    """numpy 벡터 연산으로 작업별 시작·완료 시각과 대분류별 집계 계산"""
+    times, tasks = columns["time"], columns["task"].astype(np.intp)
+    states, levels = columns["state"], columns["level"]
+    
+    # 작업별 마지막 전환의 상태, 첫 시작 시각, 마지막 완료 시각
+    last = np.full(task_count, -1, dtype=np.intp)
+    np.maximum.at(last, tasks, np.arange(len(times)))
+    seen = last >= 0
+    task_epics = np.zeros(task_count, dtype=np.int64)
+    task_epics[tasks] = columns["epic"]
+    task_levels = np.zeros(task_count, dtype=np.uint8)
+    task_levels[tasks] = levels
+    started = np.full(task_count, np.inf)
+    mask = states == ord("-")
+    np.minimum.at(started, tasks[mask], times[mask])
+    finished = np.full(task_count, -np.inf)
+    mask = states == ord("x")
+    np.maximum.at(finished, tasks[mask], times[mask])
+    final = np.zeros(task_count, dtype=np.uint8)
+    final[seen] = states[last[seen]]
+    
+    # 대분류 자신은 하위 작업 완료로 자동 처리되므로 집계에서 제외
+    done = (final == ord("x")) & (task_levels > 1)
+    timed = done & (finished >= started)
+    durations = np.where(timed, finished - started, 0.0)
+    
+    size = int(task_epics.max()) + 1 if task_count else 1
+    done_counts = np.bincount(task_epics[done], minlength=size)
+    timed_counts = np.bincount(task_epics[timed], minlength=size)
+    duration_sums = np.bincount(task_epics[timed], weights=durations[timed], minlength=size)
+    first_starts = np.full(size, np.inf)
+    has_start = seen & np.isfinite(started)
+    np.minimum.at(first_starts, task_epics[has_start], started[has_start])
+    last_finishes = np.full(size, -np.inf)
+    np.maximum.at(last_finishes, task_epics[done], finished[done])
+    
+    # 작업자는 최종 완료 전환 기준 - 되돌린 완료나 다시 완료한 작업을 중복 집계하지 않는다
+    worker_counts = np.bincount(columns["worker"][last[done]].astype(np.intp))
+    
+    epics = {}
+    for epic in np.flatnonzero(np.bincount(task_epics[seen], minlength=size)):
+        epics[int(epic)] = {
+            "done": int(done_counts[epic]),
+            "timed": int(timed_counts[epic]),
+            "duration_sum": float(duration_sums[epic]),
+            "first_start": float(first_starts[epic]),
+            "last_finish": float(last_finishes[epic]),
+        }
+    finished_done = finished[done]
+    return {
+        "done": int(done.sum()),
+        "timed": int(timed.sum()),
+        "duration_sum": float(durations.sum()),
+        "first_time": float(times.min()) if len(times) else None,
+        "last_finish": float(finished_done.max()) if len(finished_done) else None,
+        "recent": int((finished_done >= since).sum()),
+        "epics": epics,
+        "workers": {code: int(count) for code, count in enumerate(worker_counts) if count},
+    }
+
+def _velocity_python(columns: Dict[str, Any], since: float) -> Dict[str, Any]:
+    """numpy가 없을 때의 같은 집계 (행 단위 반복)"""
+    minus, done_state = ord("-"), ord("x")
+    last_state: Dict[int, int] = {}
+    task_epics: Dict[int, int] = {}
+    task_levels: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    finished: Dict[int, float] = {}
+    last_worker: Dict[int, int] = {}
+    workers: Dict[int, int] = {}
+    for when, task, epic, level, state, worker in zip(columns["time"], columns["task"], columns["epic"],
+                                                       columns["level"], columns["state"], columns["worker"]):
+        last_state[task] = state
+        last_worker[task] = worker
+        task_epics[task] = epic
+        task_levels[task] = level
+        if state == minus:
+            if when < started.get(task, float("inf")):
+                started[task] = when
+        elif state == done_state:
+            if when > finished.get(task, float("-inf")):
+                finished[task] = when
+    
+    epics: Dict[int, Dict[str, Any]] = {}
+    result = {"done": 0, "timed": 0, "duration_sum": 0.0, "last_finish": None, "recent": 0,
+              "first_time": min(columns["time"]) if len(columns["time"]) else None}
+    for task, epic in task_epics.items():
+        entry = epics.setdefault(epic, {"done": 0, "timed": 0, "duration_sum": 0.0,
+                                        "first_start": float("inf"), "last_finish": float("-inf")})
+        if task in started:
+            entry["first_start"] = min(entry["first_start"], started[task])
+        if last_state[task] != done_state or task_levels[task] <= 1:
+            continue
+        end = finished[task]
+        workers[last_worker[task]] = workers.get(last_worker[task], 0) + 1
+        entry["done"] += 1
+        entry["last_finish"] = max(entry["last_finish"], end)
+        result["done"] += 1
+        result["recent"] += end >= since
+        result["last_finish"] = end if result["last_finish"] is None else max(result["last_finish"], end)
+        if task in started and end >= started[task]:
+            entry["timed"] += 1
+            entry["duration_sum"] += end - started[task]
+            result["timed"] += 1
+            result["duration_sum"] += end - started[task]
+    result["epics"] = dict(sorted(epics.items()))
+    result["workers"] = dict(sorted(workers.items()))
+    return result
+
+def compute_velocity(store: TimingStore, now: Optional[float] = None,
+                     window_days: float = VELOCITY_WINDOW_DAYS) -> Dict[str, Any]:
+    """상태 전환 기록에서 완료 수, 작업당 소요 시간, 처리량(개/일) 계산
+
+    numpy가 있으면 열 배열 전체에 벡터 연산을 적용하고, 없으면 같은 집계를 반복문으로 한다.
+    처리량은 최근 window_days일 완료 수와, 첫 기록부터 마지막 완료까지의 평균을 함께 낸다.
+    """
+    now = time.time() if now is None else now
+    since = now - window_days * 86400
+    with trace_span("velocity"):
+        columns = store.columns()
+        if np is not None:
+            stats = _velocity_numpy(columns, len(store.task_ids()), since)
+        else:
+            stats = _velocity_python(columns, since)
+    stats["events"] = len(columns["time"])
+    # 기록이 짧으면 실제 기간으로 나누되, 하루 미만은 하루로 보아 초기 값이 튀지 않게 한다
+    age_days = (now - stats["first_time"]) / 86400 if stats["first_time"] is not None else 0.0
+    stats["recent_per_day"] = stats["recent"] / max(min(window_days, age_days), 1.0)
+    span = (stats["last_finish"] - stats["first_time"]) if stats["last_finish"] is not None else 0.0
+    stats["overall_per_day"] = stats["done"] / max(span / 86400, 1.0)
+    workers = store.workers()
+    stats["workers"] = {workers[code]: count for code, count in stats["workers"].items()}
+    return stats
+
+def _format_duration(seconds: float) -> str:
+    """소요 시간을 "2일 3시간", "3시간 5분", "45초" 형태로 변환"""
+    seconds = int(round(seconds))
+    days, rest = divmod(seconds, 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    if days:
+        return f"{days}일 {hours}시간"
+    if hours:
+        return f"{hours}시간 {minutes}분"
+    if minutes:
+        return f"{minutes}분 {secs}초"
+    return f"{secs}초"
+
+@workspace_tool("task-velocity", coalesce=True)
+async def task_velocity() -> str:
+    """작업 속도 분석 - 상태 전환 기록으로 대분류별 소요 시간, 처리량, 예상 완료일 계산
+    
+    명령어: task-velocity
+    
+    Returns:
+        str: 작업 속도와 예상 완료일 요약
+    """
+    shards = get_plan_shards()
+    if shards is not None:
+        totals = shards.totals()
+        titles = {entry["id"]: entry["title"] for entry in shards.epics}
+    else:
+        model = load_plan_model()
+        if model is None:
+            return "❌ 프로젝트 파일이 없습니다. 먼저 /task-plan으로 계획을 수립하세요."
+        totals = model.totals
+        titles = {model.task_id(epic): model.title(epic) for epic in model.epic_counts}
+    
+    now = time.time()
+    stats = compute_velocity(get_timing_store(), now)
+    if not stats["events"]:
+        return "❌ 기록된 작업 상태 전환이 없습니다. /task-start로 작업을 시작하세요."
+    
+    remaining = totals[" "] + totals["-"]
+    rate = stats["recent_per_day"] or stats["overall_per_day"]
+    mean = _format_duration(stats["duration_sum"] / stats["timed"]) if stats["timed"] else "-"
+    lines = [
+        "📈 작업 속도",
+        "",
+        f"- 기록된 상태 전환: {stats['events']}건",
+        f"- 완료된 작업: {stats['done']}개 (작업당 평균 {mean})",
+        f"- 처리량: 최근 {VELOCITY_WINDOW_DAYS}일 {stats['recent_per_day']:.1f}개/일 · "
+        f"전체 {stats['overall_per_day']:.1f}개/일",
+    ]
+    if remaining == 0:
+        lines.append("- 남은 작업: 없음 🎉")
+    elif rate > 0:
+        days = remaining / rate
+        eta = time.strftime("%Y-%m-%d", time.localtime(now + days * 86400))
+        lines.append(f"- 남은 작업: {remaining}개 → 예상 완료: {eta} (약 {days:.1f}일)")
+    else:
+        lines.append(f"- 남은 작업: {remaining}개 (완료 기록이 없어 예상 완료일을 계산할 수 없습니다)")
+    if stats["workers"]:
+        lines.append("- 작업자별 완료: " + ", ".join(f"{worker} {count}" for worker, count in stats["workers"].items()))
+    
+    lines.extend(["", "대분류별:"])
+    for epic, entry in stats["epics"].items():
+        label = f"{epic}. {titles[str(epic)]}" if str(epic) in titles else f"{epic}."
+        if entry["last_finish"] > entry["first_start"]:
+            elapsed = _format_duration(entry["last_finish"] - entry["first_start"])
+        else:
+            elapsed = "-"
+        mean = _format_duration(entry["duration_sum"] / entry["timed"]) if entry["timed"] else "-"
+        lines.append(f"- {label}: 완료 {entry['done']}개, 첫 시작부터 마지막 완료까지 {elapsed}, 작업당 평균 {mean}")
+    return "\n".join(lines)
+
+def _format_counts(counts: Dict[str, int]) -> str:
+    """상태별 작업 수를 "완료 n/m (p%) · 진행중 n · 대기중 n" 형태로 변환"""
+    total = sum(counts.values())
+    done = counts["x"]
+    percent = done / total * 100 if total else 0.0
+    return (f"완료 {done}/{total} ({percent:.1f}%) · "
+            f"{TASK_STATUSES['-']} {counts['-']} · {TASK_STATUSES[' ']} {counts[' ']}")
+
+@workspace_tool("task-clean")
+async def task_clean(ctx: Optional[Context] = None) -> str:
     """프로젝트 파일들을 삭제하고 초기화
     
     명령어: task-clean
     
+    Args:
+        ctx: MCP 요청 컨텍스트 (단계별 진행 알림과 취소 확인에 사용)
+        
     Returns:
         str: 삭제 결과 메시지
     """
-    import shutil
-    
     deleted_files = []
     
-    # docs 디렉토리 전체 삭제
+    # docs 디렉토리는 숨김 이름으로 옮겨 한 번에 작업 공간에서 떼어낸 뒤 실제 삭제는 나중에 한다
+    # (옮기기 전에 취소되면 그대로, 옮긴 뒤에는 취소되어도 초기화된 상태가 남는다)
+    await report_phase(ctx, 0, 2, "프로젝트 파일 삭제 중")
     if DOCS_DIR.exists():
         try:
-            shutil.rmtree(DOCS_DIR)
+            DOCS_DIR.rename(f".{DOCS_DIR.name}.trash-{os.getpid()}-{time.time_ns()}")
             deleted_files.append("📁 docs/ 디렉토리")
         except Exception as e:
             return f"❌ docs 디렉토리 삭제 실패: {e}"
@@ -1131,6 +3617,21 @@ async def task_clean() -> str:
         except Exception as e:
             return f"❌ 상태 파일 삭제 실패: {e}"
     
+    _invalidate_snapshot(str(DOCS_DIR))
+    _invalidate_snapshot(str(claude_file))
+    _workspace_watcher.clear()
+    _response_cache.clear()
+    _drop_plan_caches()
+    
+    # 옮겨 둔 docs (이전에 정리 도중 취소된 것 포함) 삭제 - 취소되어도 스레드는 끝까지 지운다
+    trash_dirs = [path for path in Path(".").glob(f".{DOCS_DIR.name}.trash-*") if path.is_dir()]
+    if trash_dirs:
+        if ctx is not None:
+            await ctx.report_progress(1, 2, "docs 디렉토리 정리 중")
+        await asyncio.to_thread(lambda: [shutil.rmtree(path, ignore_errors=True) for path in trash_dirs])
+    if ctx is not None:
+        await ctx.report_progress(2, 2, "프로젝트 초기화 완료")
+    
     if deleted_files:
         return f"""🧹 프로젝트 초기화 완료!
 
@@ -1141,6 +3642,399 @@ async def task_clean() -> str:
     else:
         return "✨ 삭제할 파일이 없습니다. 프로젝트가 이미 깨끗합니다."
 
+def _hash_file(file_path: Path) -> str:
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_snapshot_index() -> Dict[str, Any]:
+    """스냅샷 색인 로드 - 내용 해시별 보관 아카이브와 파일별 마지막 stat/해시"""
+    index_file = SNAPSHOT_DIR / "index.json"
+    if not index_file.exists():
+        return {"objects": {}, "files": {}, "snapshots": []}
+    with open(index_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_atomic(file_path: Path, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체하여 중간 상태가 보이지 않게 저장"""
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+def create_snapshot(name: Optional[str] = None) -> Dict[str, Any]:
+    """docs/ 디렉토리 스냅샷 생성
+
+    내용 해시로 중복을 제거하여 이전 스냅샷에 이미 있는 내용은 다시 저장하지 않고,
+    크기·수정 시각·inode가 마지막 스냅샷과 같은 파일은 해시 계산도 건너뛴다.
+    스냅샷 하나는 목록(manifest.json)과 새 내용만 담은 압축 아카이브 한 개이다.
+    """
+    index = _load_snapshot_index()
+    name = name or time.strftime("%Y%m%d-%H%M%S")
+    if name in index["snapshots"]:
+        name = f"{name}-{len(index['snapshots'])}"
+    
+    files: Dict[str, Dict[str, Any]] = {}
+    new_objects: Dict[str, Path] = {}
+    unchanged = 0
+    for file_path in sorted(DOCS_DIR.rglob("*")):
+        if not file_path.is_file():
+            continue
+        rel_path = file_path.as_posix()
+        st = file_path.stat()
+        stat_key = [st.st_size, st.st_mtime_ns, st.st_ino]
+        previous = index["files"].get(rel_path)
+        if previous is not None and previous["stat"] == stat_key:
+            content_hash = previous["hash"]
+        else:
+            content_hash = _hash_file(file_path)
+            # 방금 수정된 파일은 같은 시각 안에 다시 바뀌어도 stat이 같을 수 있으므로
+            # 다음 스냅샷에서 해시를 다시 계산하도록 stat을 기록하지 않는다
+            if time.time_ns() - st.st_mtime_ns < SNAPSHOT_RACY_WINDOW_NS:
+                stat_key = None
+            index["files"][rel_path] = {"stat": stat_key, "hash": content_hash}
+        if previous is not None and previous["hash"] == content_hash:
+            unchanged += 1
+        if content_hash not in index["objects"]:
+            new_objects.setdefault(content_hash, file_path)
+        files[rel_path] = {"hash": content_hash, "size": st.st_size}
+    
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    archive_name = f"{name}.zip"
+    tmp_archive = SNAPSHOT_DIR / f".{archive_name}.{os.getpid()}.tmp"
+    manifest = {"name": name, "created": time.time(), "files": files}
+    with zipfile.ZipFile(tmp_archive, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+        for content_hash, file_path in new_objects.items():
+            archive.write(file_path, f"objects/{content_hash}")
+    os.replace(tmp_archive, SNAPSHOT_DIR / archive_name)
+    
+    for content_hash in new_objects:
+        index["objects"][content_hash] = archive_name
+    index["snapshots"].append(name)
+    _write_atomic(SNAPSHOT_DIR / "index.json", json.dumps(index, ensure_ascii=False).encode("utf-8"))
+    
+    return {"name": name, "files": len(files), "stored": len(new_objects), "unchanged": unchanged}
+
+def _forget_docs() -> None:
+    """docs/ 전체가 바뀐 뒤 요청 스냅샷과 모든 캐시 무효화"""
+    _invalidate_snapshot(str(DOCS_DIR))
+    _workspace_watcher.clear()
+    _response_cache.clear()
+    _drop_plan_caches()
+
+def recover_interrupted_restore() -> bool:
+    """docs/ 교체 도중 중단된 스냅샷 복원 마무리 - 마무리할 복원이 있었으면 True
+
+    복원은 docs/를 옮겨 두고 새 디렉토리로 바꾸기 전에 두 이름을 RESTORE_JOURNAL에 적고,
+    교체가 끝나면 지운다. 기록이 남아 있는데 docs/가 없으면 두 이름 바꾸기 사이에서 멈춘
+    것이므로 옮겨 둔 docs/를 되돌리고, docs/가 있으면 교체는 끝났으므로 옮겨 둔 것만 지운다.
+    """
+    if not check_file_exists(RESTORE_JOURNAL):
+        return False
+    with open(RESTORE_JOURNAL, 'r', encoding='utf-8') as f:
+        journal = json.load(f)
+    backup = Path(journal["backup"])
+    if not DOCS_DIR.exists() and backup.is_dir():
+        os.rename(backup, DOCS_DIR)
+        print(f"⚠️ 스냅샷 복원이 중단되어 이전 {DOCS_DIR}/를 되돌렸습니다.", file=sys.stderr)
+    else:
+        shutil.rmtree(backup, ignore_errors=True)
+    shutil.rmtree(journal["staging"], ignore_errors=True)
+    delete_file(RESTORE_JOURNAL)
+    _forget_docs()
+    return True
+
+def restore_snapshot(name: str) -> int:
+    """스냅샷으로 docs/ 디렉토리 복원 - 복원된 파일 수 반환
+
+    새 디렉토리에 모든 파일을 만들고 해시를 검증한 뒤 docs/와 이름을 바꿔 교체하므로,
+    실패하면 기존 docs/가 그대로 남는다. 두 이름 바꾸기 사이에서 프로세스가 죽으면
+    RESTORE_JOURNAL 기록으로 다음 요청에서 이전 docs/를 되돌린다.
+    """
+    recover_interrupted_restore()
+    index = _load_snapshot_index()
+    with zipfile.ZipFile(SNAPSHOT_DIR / f"{name}.zip") as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+    
+    # 내용이 들어 있는 아카이브별로 묶어서 한 번씩만 연다
+    by_archive: Dict[str, List[str]] = {}
+    for rel_path, entry in manifest["files"].items():
+        by_archive.setdefault(index["objects"][entry["hash"]], []).append(rel_path)
+    
+    staging = Path(f"{DOCS_DIR}.restore-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        for archive_name, rel_paths in by_archive.items():
+            with zipfile.ZipFile(SNAPSHOT_DIR / archive_name) as archive:
+                for rel_path in rel_paths:
+                    entry = manifest["files"][rel_path]
+                    data = archive.read(f"objects/{entry['hash']}")
+                    if hashlib.sha256(data).hexdigest() != entry["hash"]:
+                        raise ValueError(f"{rel_path} 내용이 손상되었습니다")
+                    target = staging / Path(rel_path).relative_to(DOCS_DIR)
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_bytes(data)
+        staging.mkdir(exist_ok=True)
+        
+        # docs/ 교체: 기존 디렉토리를 옆으로 옮긴 뒤 새 디렉토리로 바꾼다
+        backup = Path(f"{DOCS_DIR}.old-{os.getpid()}")
+        _write_atomic(Path(RESTORE_JOURNAL), json.dumps({"backup": str(backup), "staging": str(staging)}).encode("utf-8"))
+        invalidate_file(RESTORE_JOURNAL)
+        if DOCS_DIR.exists():
+            os.rename(DOCS_DIR, backup)
+        try:
+            os.rename(staging, DOCS_DIR)
+        except OSError:
+            if backup.exists():
+                os.rename(backup, DOCS_DIR)
+            delete_file(RESTORE_JOURNAL)
+            raise
+        shutil.rmtree(backup, ignore_errors=True)
+        delete_file(RESTORE_JOURNAL)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    
+    _forget_docs()
+    return len(manifest["files"])
+
+@workspace_tool("task-snapshot")
+async def task_snapshot(name: Optional[str] = None) -> str:
+    """작업 상태 스냅샷 - docs/ 디렉토리를 압축 아카이브로 저장
+    
+    명령어: task-snapshot
+    
+    Args:
+        name: 스냅샷 이름 (생략 시 현재 시각)
+        
+    Returns:
+        str: 스냅샷 생성 결과 메시지
+    """
+    if name and not SNAPSHOT_NAME.match(name):
+        return "❌ 스냅샷 이름은 영문, 숫자, '.', '_', '-'만 사용할 수 있습니다."
+    if not DOCS_DIR.exists():
+        return "❌ docs 디렉토리가 없습니다. 저장할 작업 상태가 없습니다."
+    
+    result = create_snapshot(name)
+    return f"""📸 스냅샷 '{result["name"]}' 생성 완료
+
+- 파일 {result["files"]}개 (새로 저장 {result["stored"]}개, 변경 없음 {result["unchanged"]}개)
+
+↩️ /task-restore로 이 시점의 상태를 복원할 수 있습니다."""
+
+@workspace_tool("task-restore")
+async def task_restore(name: Optional[str] = None) -> str:
+    """작업 상태 복원 - 스냅샷으로 docs/ 디렉토리 전체를 되돌림
+    
+    명령어: task-restore
+    
+    Args:
+        name: 복원할 스냅샷 이름 (생략 시 가장 최근 스냅샷)
+        
+    Returns:
+        str: 복원 결과 메시지
+    """
+    snapshots = _load_snapshot_index()["snapshots"]
+    if not snapshots:
+        return "❌ 저장된 스냅샷이 없습니다. 먼저 /task-snapshot을 실행하세요."
+    name = name or snapshots[-1]
+    if name not in snapshots:
+        recent = ", ".join(snapshots[-5:])
+        return f"❌ '{name}' 스냅샷이 없습니다. 최근 스냅샷: {recent}"
+    
+    try:
+        restored = restore_snapshot(name)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        return f"❌ 스냅샷 복원 실패 (기존 상태 유지): {e}"
+    
+    return f"""↩️ 스냅샷 '{name}' 복원 완료
+
+- 파일 {restored}개 복원"""
+
+def load_batch_script(file_path: str) -> List[Dict[str, Any]]:
+    """배치 스크립트 로드 - JSON 배열 또는 JSONL ("-"면 표준 입력), 각 단계는 {"tool", "args"}"""
+    text = sys.stdin.read() if file_path == "-" else Path(file_path).read_text(encoding="utf-8")
+    text = text.strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+async def run_batch(steps: List[Dict[str, Any]], workspaces: List[str], stop_on_error: bool = False,
+                    on_result=None) -> List[Dict[str, Any]]:
+    """작업 공간마다 스크립트의 도구 호출을 차례로 실행 (한 프로세스, 한 이벤트 루프)
+
+    MCP 전송 없이 등록된 도구 함수를 직접 호출하므로 파일 지문, 계획 모델, 응답 캐시가
+    단계와 작업 공간 사이에서 그대로 유지된다. "❌"로 시작하는 응답과 예외는 실패로
+    기록하며, stop_on_error면 해당 작업 공간의 남은 단계를 건너뛴다.
+    """
+    origin = os.getcwd()
+    results = []
+    
+    def record(result: Dict[str, Any]) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    
+    try:
+        for workspace in workspaces:
+            root = os.path.abspath(os.path.join(origin, workspace))
+            try:
+                os.chdir(root)
+            except OSError as e:
+                record({"workspace": root, "step": 0, "tool": None, "ok": False,
+                        "message": f"❌ 작업 공간을 열 수 없습니다: {e}", "elapsed_ms": 0.0})
+                continue
+            for number, step in enumerate(steps, 1):
+                tool = step.get("tool")
+                started = time.perf_counter()
+                if tool not in _tools:
+                    message = f"❌ 알 수 없는 도구입니다: {tool}"
+                else:
+                    try:
+                        message = await _tools[tool](**(step.get("args") or {}))
+                    except Exception as e:
+                        message = f"❌ {type(e).__name__}: {e}"
+                ok = not message.startswith("❌")
+                record({"workspace": root, "step": number, "tool": tool, "ok": ok, "message": message,
+                        "elapsed_ms": (time.perf_counter() - started) * 1000})
+                if not ok and stop_on_error:
+                    break
+    finally:
+        os.chdir(origin)
+    return results
+
+def _trace_files(paths: List[str]) -> List[str]:
+    """요약할 추적 파일 목록 - 지정하지 않으면 기본 파일과 회전된 이전 파일들 (오래된 순)"""
+    if paths:
+        return paths
+    rotated = [f"{TRACE_FILE}.{index}" for index in range(TRACE_BACKUPS, 0, -1)]
+    return [path for path in rotated + [TRACE_FILE] if os.path.exists(path)]
+
+def summarize_traces(paths: List[str]) -> Dict[str, Any]:
+    """추적 구간을 도구별·단계별 지연 시간으로 집계
+
+    각 구간은 자신이 속한 추적의 최상위 도구 이름 아래에 모이고, 단계 시간은 구간 길이에서
+    직접 하위 구간 길이를 뺀 자체 시간이다. 중첩된 구간이 상위 단계와 하위 단계에 두 번
+    집계되지 않으므로 도구별 단계 비율을 더하면 100%가 된다. 최상위 구간의 자체 시간은
+    "(self)" 단계로 보고한다.
+    """
+    spans: List[Dict[str, Any]] = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    
+    roots = {span["trace"]: span for span in spans if span.get("parent") is None}
+    child_totals: Dict[Tuple[str, str], float] = {}
+    for span in spans:
+        if span.get("parent") is not None:
+            key = (span["trace"], span["parent"])
+            child_totals[key] = child_totals.get(key, 0.0) + span["duration_ms"]
+    calls: Dict[str, List[float]] = {}
+    phases: Dict[Tuple[str, str], List[float]] = {}
+    for span in spans:
+        root = roots.get(span["trace"])
+        if root is None:
+            # 회전으로 최상위 구간이 잘린 추적은 제외
+            continue
+        self_ms = max(0.0, span["duration_ms"] - child_totals.get((span["trace"], span["span"]), 0.0))
+        if span is root:
+            calls.setdefault(root["name"], []).append(root["duration_ms"])
+            phases.setdefault((root["name"], "(self)"), []).append(self_ms)
+        else:
+            phases.setdefault((root["name"], span["name"]), []).append(self_ms)
+    
+    def stats(values: List[float]) -> Dict[str, float]:
+        ordered = sorted(values)
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+        return {
+            "count": len(ordered),
+            "total_ms": sum(ordered),
+            "mean_ms": sum(ordered) / len(ordered),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": ordered[-1],
+        }
+    
+    tools: Dict[str, Any] = {}
+    for tool, values in calls.items():
+        total = stats(values)
+        tools[tool] = {key: total[key] for key in ("count", "p50_ms", "p95_ms", "max_ms")}
+        tools[tool]["phases"] = {}
+    for (tool, name), values in phases.items():
+        tools[tool]["phases"][name] = stats(values)
+    for tool, entry in tools.items():
+        total_ms = sum(phase["total_ms"] for phase in entry["phases"].values())
+        for phase in entry["phases"].values():
+            phase["share"] = phase["total_ms"] / total_ms if total_ms else 0.0
+        entry["phases"] = dict(sorted(entry["phases"].items(), key=lambda item: -item[1]["total_ms"]))
+    return {"spans": len(spans), "traces": len(roots), "tools": dict(sorted(tools.items()))}
+
+def _format_trace_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"추적 {summary['traces']}건, 구간 {summary['spans']}개"]
+    for tool, entry in summary["tools"].items():
+        lines.append("")
+        lines.append(f"{tool}  호출 {entry['count']}회  p50 {entry['p50_ms']:.2f}ms  "
+                     f"p95 {entry['p95_ms']:.2f}ms  max {entry['max_ms']:.2f}ms")
+        lines.append(f"  {'phase':<28}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'share':>8}")
+        for name, phase in entry["phases"].items():
+            lines.append(f"  {name:<28}{phase['count']:>8}{phase['mean_ms']:>10.2f}"
+                         f"{phase['p50_ms']:>10.2f}{phase['p95_ms']:>10.2f}{phase['share']:>8.1%}")
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """명령행 진입점 - 인자가 없으면 MCP 서버 실행"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        # 서버 실행
+        mcp.run()
+        return
+    
+    parser = argparse.ArgumentParser(prog="mcp_task_manager.py", description="MCP Task Manager")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    plan_batch = commands.add_parser("plan-batch", help="여러 작업 공간의 계획을 병렬로 수립")
+    plan_batch.add_argument("workspaces", nargs="+", help="작업 공간 루트 경로")
+    plan_batch.add_argument("--workers", type=int, default=None, help="최대 작업자 프로세스 수")
+    
+    batch = commands.add_parser("batch", help="JSON/JSONL 스크립트의 도구 호출을 MCP 없이 한 프로세스에서 실행")
+    batch.add_argument("script", help="스크립트 파일 (JSON 배열 또는 JSONL, '-'면 표준 입력)")
+    batch.add_argument("--workspace", "-w", action="append", dest="workspaces",
+                       help="스크립트를 실행할 작업 공간 (여러 번 지정 가능, 기본값: 현재 디렉토리)")
+    batch.add_argument("--stop-on-error", action="store_true", help="실패한 단계 이후 같은 작업 공간의 단계 건너뛰기")
+    
+    trace_summary = commands.add_parser("trace-summary", help="추적 구간 로그를 단계별 지연 시간으로 요약")
+    trace_summary.add_argument("files", nargs="*", help=f"추적 파일 (기본값: {os.path.relpath(TRACE_FILE)} 및 회전된 파일)")
+    trace_summary.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        def emit(result: Dict[str, Any]) -> None:
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+        steps = load_batch_script(args.script)
+        results = asyncio.run(run_batch(steps, args.workspaces or ["."], args.stop_on_error, emit))
+        sys.exit(0 if all(result["ok"] for result in results) else 1)
+    elif args.command == "trace-summary":
+        files = _trace_files(args.files)
+        if not files:
+            print("❌ 추적 파일이 없습니다. TASK_MCP_TRACE=1 로 서버를 실행해 구간을 기록하세요.", file=sys.stderr)
+            sys.exit(1)
+        summary = summarize_traces(files)
+        print(json.dumps(summary, ensure_ascii=False, indent=2) if args.json else _format_trace_summary(summary))
+    elif args.command == "plan-batch":
+        results = plan_workspaces(args.workspaces, args.workers)
+        for result in results:
+            print(json.dumps(result, ensure_ascii=False))
+        sys.exit(0 if all(result["ok"] for result in results) else 1)
+
 if __name__ == "__main__":
-    # 서버 실행
-    mcp.run()
\ No newline at end of file
+    main()
\ No newline at end of file
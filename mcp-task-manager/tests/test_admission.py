@@ -0,0 +1,109 @@
+"""프로젝트별 요청 수락 제어 회귀 테스트"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+def write_plan() -> None:
+    lines = ["# 프로젝트: small", ""]
+    for e in range(1, 3):
+        lines.append(f"[ ] {e}. 에픽 {e}")
+        lines.append(f"- [ ] {e}.1. 기능 {e}.1")
+        lines.append(f"  - [ ] {e}.1.1. 작업 {e}.1.1")
+        lines.append("")
+    Path("docs").mkdir()
+    Path(m.PLAN_FILE).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_full_queue_is_rejected_without_waiting():
+    admission = m.AdmissionControl(1, 1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "done"
+
+        running = asyncio.ensure_future(admission.run("p", None, hold))
+        queued = asyncio.ensure_future(admission.run("p", None, hold))
+        await asyncio.sleep(0)
+        rejected = await admission.run("p", None, hold)
+        release.set()
+        return rejected, await running, await queued
+
+    rejected, first, second = asyncio.run(run())
+    assert rejected.startswith("❌ 서버가 바쁩니다")
+    assert (first, second) == ("done", "done")
+    assert admission.stats() == {"admitted": 2, "coalesced": 0, "rejected": 1, "projects": {}}
+
+
+def test_waiter_cancelled_after_handoff_passes_slot_on():
+    admission = m.AdmissionControl(1, 2)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "held"
+
+        async def quick():
+            return "next"
+
+        running = asyncio.ensure_future(admission.run("p", None, hold))
+        handed = asyncio.ensure_future(admission.run("p", None, quick))
+        after = asyncio.ensure_future(admission.run("p", None, quick))
+        await asyncio.sleep(0)
+
+        # 슬롯을 넘겨받았지만 아직 깨어나지 않은 대기 요청을 그 자리에서 취소
+        release_slot = admission._release
+
+        def release_then_cancel(project, lane):
+            admission._release = release_slot
+            release_slot(project, lane)
+            handed.cancel()
+
+        admission._release = release_then_cancel
+        release.set()
+        assert await running == "held"
+        return await asyncio.gather(handed, after, return_exceptions=True)
+
+    handed, after = asyncio.run(run())
+    assert isinstance(handed, asyncio.CancelledError)
+    assert after == "next"
+    assert admission.stats()["projects"] == {}
+
+
+def test_identical_reads_share_one_queue_slot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_plan()
+    admission = m.AdmissionControl(1, 1)
+    monkeypatch.setattr(m, "_admission", admission)
+
+    async def run():
+        await m.task_start()
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+
+        # 다른 요청이 슬롯을 잡고 있는 동안 같은 task-resume이 한꺼번에 들어온다
+        writer = asyncio.ensure_future(admission.run(str(tmp_path), None, hold))
+        await asyncio.sleep(0)
+        burst = asyncio.ensure_future(asyncio.gather(*(m.task_resume() for _ in range(4))))
+        await asyncio.sleep(0)
+        release.set()
+        await writer
+        return await burst
+
+    results = asyncio.run(run())
+    assert len(set(results)) == 1
+    assert not results[0].startswith("❌")
+    stats = admission.stats()
+    assert stats["rejected"] == 0 and stats["coalesced"] == 3
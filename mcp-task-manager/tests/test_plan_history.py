@@ -0,0 +1,42 @@
+"""계획 수정 이력 되돌리기 회귀 테스트"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+def write_plan() -> None:
+    lines = ["# 프로젝트: small", ""]
+    for e in range(1, 3):
+        lines.append(f"[ ] {e}. 에픽 {e}")
+        for f in range(1, 3):
+            lines.append(f"- [ ] {e}.{f}. 기능 {e}.{f}")
+            for g in range(1, 3):
+                lines.append(f"  - [ ] {e}.{f}.{g}. 작업 {e}.{f}.{g}")
+        lines.append("")
+    Path("docs").mkdir()
+    Path(m.PLAN_FILE).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_undo_drops_cached_model_when_fingerprint_is_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_plan()
+
+    async def run():
+        await m.task_start()
+        # mtime 해상도가 낮은 파일 시스템처럼 되돌린 뒤에도 지문이 같게 만든다
+        stat = os.stat(m.PLAN_FILE)
+        assert (await m.task_undo()).startswith("↩️")
+        os.utime(m.PLAN_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        return await m.task_start()
+
+    result = asyncio.run(run())
+    assert "1. 에픽 1" in result
+    model = m.load_plan_model()
+    assert model.status(0) == "-"
+    assert Path(m.PLAN_FILE).read_text(encoding="utf-8").count("[-]") == len(model.in_progress)
@@ -0,0 +1,53 @@
+"""분할 저장 계획의 병합 보기 회귀 테스트"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+def write_big_plan(epics: int = 40) -> None:
+    lines = ["# 프로젝트: big", ""]
+    for e in range(1, epics + 1):
+        lines.append(f"[ ] {e}. 에픽 {e}")
+        for f in range(1, 6):
+            lines.append(f"- [ ] {e}.{f}. 기능 {e}.{f}")
+            for g in range(1, 6):
+                lines.append(f"  - [ ] {e}.{f}.{g}. 작업 {e}.{f}.{g}")
+        lines.append("")
+    Path("docs").mkdir()
+    Path(m.PLAN_FILE).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def totals(status_text: str) -> tuple:
+    match = re.search(r"\*\*전체\*\*: 완료 (\d+)/\d+ .*진행중 (\d+)", status_text)
+    return int(match.group(1)), int(match.group(2))
+
+
+def test_edit_merged_view_after_task_complete(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(m, "PLAN_SHARD_THRESHOLD", 20000)
+    write_big_plan()
+
+    async def run():
+        for _ in range(4):
+            await m.task_start()
+        await m.task_complete()
+        await m.task_start()
+        before = totals(await m.task_status())
+        assert m.get_plan_shards() is not None
+
+        # 사람이 병합 보기에서 체크 박스 하나를 직접 표시
+        plan = Path(m.PLAN_FILE)
+        plan.write_text(plan.read_text(encoding="utf-8").replace("[ ] 40.5.5.", "[x] 40.5.5."),
+                        encoding="utf-8")
+        after = totals(await m.task_status())
+        return before, after
+
+    before, after = asyncio.run(run())
+    assert before[0] >= 1 and before[1] >= 1
+    assert after == (before[0] + 1, before[1])
@@ -0,0 +1,110 @@
+"""작업 상태 스냅샷·복원 회귀 테스트"""
+
+import asyncio
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+def write_docs() -> None:
+    Path("docs").mkdir()
+    Path(m.PLAN_FILE).write_text("# 프로젝트: small\n\n[ ] 1. A\n- [ ] 1.1. A1\n", encoding="utf-8")
+    Path("docs/requirements.md").write_text("요구사항\n", encoding="utf-8")
+
+
+def read_docs() -> dict:
+    return {path.as_posix(): path.read_bytes() for path in sorted(Path("docs").rglob("*")) if path.is_file()}
+
+
+def leftovers() -> list:
+    return sorted(path.name for path in Path(".").iterdir() if path.name.startswith(("docs.", m.RESTORE_JOURNAL)))
+
+
+def test_restore_round_trip_stores_only_changed_content(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_docs()
+
+    async def run():
+        first = await m.task_snapshot("first")
+        original = read_docs()
+        Path("docs/requirements.md").write_text("바뀐 요구사항\n", encoding="utf-8")
+        second = await m.task_snapshot("second")
+        restored = await m.task_restore("first")
+        return first, second, restored, original
+
+    first, second, restored, original = asyncio.run(run())
+    assert "새로 저장 2개" in first
+    assert "새로 저장 1개, 변경 없음 1개" in second
+    assert restored.startswith("↩️")
+    assert read_docs() == original
+    with zipfile.ZipFile(m.SNAPSHOT_DIR / "second.zip") as archive:
+        assert len([name for name in archive.namelist() if name.startswith("objects/")]) == 1
+    assert leftovers() == []
+
+
+def test_corrupted_object_leaves_docs_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_docs()
+    asyncio.run(m.task_snapshot("first"))
+
+    archive_path = m.SNAPSHOT_DIR / "first.zip"
+    with zipfile.ZipFile(archive_path) as archive:
+        entries = {name: archive.read(name) for name in archive.namelist()}
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data + b"x" if name.startswith("objects/") else data)
+    Path("docs/requirements.md").write_text("편집 중\n", encoding="utf-8")
+    before = read_docs()
+
+    result = asyncio.run(m.task_restore("first"))
+    assert result.startswith("❌ 스냅샷 복원 실패 (기존 상태 유지)")
+    assert read_docs() == before
+    assert leftovers() == []
+
+
+def test_swap_interrupted_between_renames_is_rolled_back(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_docs()
+    asyncio.run(m.task_snapshot("first"))
+    Path("docs/requirements.md").write_text("편집 중\n", encoding="utf-8")
+    before = read_docs()
+
+    rename = os.rename
+
+    def crash_on_second_rename(src, dst):
+        if str(dst) == str(m.DOCS_DIR):
+            raise KeyboardInterrupt
+        rename(src, dst)
+
+    monkeypatch.setattr(m.os, "rename", crash_on_second_rename)
+    with pytest.raises(KeyboardInterrupt):
+        m.restore_snapshot("first")
+    monkeypatch.setattr(m.os, "rename", rename)
+    assert not Path("docs").exists()
+
+    # 다음 요청이 옮겨 둔 docs/를 되돌린다
+    status = asyncio.run(m.task_status())
+    assert "1. A" in status
+    assert read_docs() == before
+    assert leftovers() == []
+
+
+def test_swap_interrupted_after_renames_keeps_restored_docs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_docs()
+    before = read_docs()
+    Path("docs.old-1").mkdir()
+    Path("docs.old-1/requirements.md").write_text("이전 내용\n", encoding="utf-8")
+    Path(m.RESTORE_JOURNAL).write_text(json.dumps({"backup": "docs.old-1", "staging": "docs.restore-1"}), encoding="utf-8")
+
+    asyncio.run(m.task_status())
+    assert read_docs() == before
+    assert leftovers() == []
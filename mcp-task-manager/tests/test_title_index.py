@@ -0,0 +1,54 @@
+"""제목 역색인 캐시 회귀 테스트"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+def write_plan(path: Path, name: str) -> str:
+    lines = [f"# 프로젝트: {name}", "", f"[ ] 1. {name} 설정", f"- [ ] 1.1. {name} 환경", ""]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return os.path.abspath(path)
+
+
+def test_index_is_freed_with_its_evicted_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(m, "PLAN_MODEL_CACHE_SIZE", 2)
+    monkeypatch.setattr(m, "_plan_models", m.OrderedDict())
+    monkeypatch.setattr(m, "_title_indexes", m.OrderedDict())
+    paths = [write_plan(tmp_path / f"ws{n}" / "plan.md", f"p{n}") for n in range(3)]
+
+    async def run():
+        index = await m.get_title_index(m.load_plan_model(paths[0]), paths[0])
+        assert index.search("p0") == [0, 1]
+        m.load_plan_model(paths[1])
+        # 최근에 쓴 모델은 밀려나지 않는다
+        m.load_plan_model(paths[0])
+        m.load_plan_model(paths[2])
+
+    asyncio.run(run())
+    assert list(m._plan_models) == [paths[0], paths[2]]
+    assert list(m._title_indexes) == [paths[0]]
+    m.load_plan_model(paths[1])
+    assert paths[0] not in m._plan_models and paths[0] not in m._title_indexes
+
+
+def test_index_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(m, "TITLE_INDEX_CACHE_SIZE", 2)
+    monkeypatch.setattr(m, "_title_indexes", m.OrderedDict())
+    paths = [write_plan(tmp_path / f"ws{n}" / "plan.md", f"p{n}") for n in range(3)]
+
+    async def run():
+        results = []
+        for n, path in enumerate(paths):
+            index = await m.get_title_index(m.load_plan_model(path), path)
+            results.append(index.search(f"p{n} 환경"))
+        return results
+
+    assert asyncio.run(run()) == [[1], [1], [1]]
+    assert list(m._title_indexes) == paths[1:]
@@ -0,0 +1,28 @@
+"""추적 요약 회귀 테스트"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+def test_nested_spans_are_not_double_counted(tmp_path):
+    spans = [
+        {"trace": "t1", "span": "a", "parent": None, "name": "task-new-answer", "duration_ms": 10.0},
+        {"trace": "t1", "span": "b", "parent": "a", "name": "_generate_requirements_docs", "duration_ms": 6.0},
+        {"trace": "t1", "span": "c", "parent": "b", "name": "save_to_file", "duration_ms": 4.0},
+        {"trace": "t1", "span": "d", "parent": "a", "name": "save_to_file", "duration_ms": 1.0},
+    ]
+    path = tmp_path / "spans.jsonl"
+    path.write_text("".join(json.dumps(span) + "\n" for span in spans), encoding="utf-8")
+
+    tool = m.summarize_traces([str(path)])["tools"]["task-new-answer"]
+    phases = tool["phases"]
+    assert tool["count"] == 1 and tool["max_ms"] == 10.0
+    assert phases["(self)"]["total_ms"] == 3.0
+    assert phases["_generate_requirements_docs"]["total_ms"] == 2.0
+    assert phases["save_to_file"]["total_ms"] == 5.0
+    assert abs(sum(phase["share"] for phase in phases.values()) - 1.0) < 1e-9
@@ -0,0 +1,31 @@
+"""작업 속도 집계 회귀 테스트"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_workers_count_final_completions(tmp_path, monkeypatch, use_numpy):
+    if use_numpy and m.np is None:
+        pytest.skip("numpy 미설치")
+    if not use_numpy:
+        monkeypatch.setattr(m, "np", None)
+    store = m.TimingStore(str(tmp_path / "timing"))
+    now = 1_700_000_000.0
+    monkeypatch.setattr(m, "TIMING_WORKER", "alice")
+    store.append([("1.1.1", "-"), ("1.1.2", "-")], when=now)
+    store.append([("1.1.1", "x"), ("1.1.2", "x")], when=now + 60)
+    # 1.1.2 완료를 되돌렸다가 다른 작업자가 다시 완료, 1.1.1은 되돌린 채로 둔다
+    store.append([("1.1.1", "-"), ("1.1.2", "-")], when=now + 120)
+    monkeypatch.setattr(m, "TIMING_WORKER", "bob")
+    store.append([("1.1.2", "x")], when=now + 180)
+
+    stats = m.compute_velocity(store, now + 240)
+    assert stats["done"] == 1
+    assert stats["workers"] == {"bob": 1}
@@ -0,0 +1,62 @@
+"""inotify 작업 공간 감시 회귀 테스트"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_task_manager as m
+
+pytestmark = pytest.mark.skipif(not m._workspace_watcher.active, reason="inotify를 쓸 수 없는 환경")
+
+
+def write_plan() -> None:
+    lines = ["# 프로젝트: small", "", "[ ] 1. A"]
+    for f in range(1, 3):
+        lines.append(f"- [ ] 1.{f}. A{f}")
+        lines.append(f"  - [ ] 1.{f}.1. A{f}-1")
+    lines += ["", "[ ] 2. B", "- [ ] 2.1. B1", "  - [ ] 2.1.1. B1-1", ""]
+    Path("docs").mkdir()
+    Path(m.PLAN_FILE).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_same_fingerprint_edit_reaches_plan_caches(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_plan()
+
+    async def run():
+        await m.task_start()
+        assert "A" in await m.task_find("A")
+        # 진행 표시를 1에서 1.2로 옮기는 같은 크기의 편집 후 수정 시각까지 되돌린다
+        stat = os.stat(m.PLAN_FILE)
+        content = Path(m.PLAN_FILE).read_text(encoding="utf-8")
+        content = content.replace("[-] 1. A", "[ ] 1. A").replace("- [ ] 1.2. A2", "- [-] 1.2. A2")
+        with open(m.PLAN_FILE, 'r+b') as f:
+            f.write(content.encode("utf-8"))
+        os.utime(m.PLAN_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert m._stat_fingerprint(m.PLAN_FILE) == (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return await m.task_resume(), await m.task_status(), await m.task_find("A2", status="진행중")
+
+    resume, status, found = asyncio.run(run())
+    assert "현재 진행중: 1.2. A2" in resume
+    assert "[-] 1.2. A2" in found
+    assert m.load_plan_model().status(0) == " "
+    assert "- [ ] 1. A: 완료 0/4 (0.0%) · 진행중 1 · 대기중 3" in status
+
+
+def test_own_status_writes_keep_cached_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_plan()
+
+    async def run():
+        await m.task_start()
+        model = m.load_plan_model()
+        await m.task_complete()
+        return model
+
+    model = asyncio.run(run())
+    assert m.load_plan_model() is model